@@ -0,0 +1,78 @@
+# Regenerates configuration of many projects in parallel.
+# Usage: python3 batch.py [--jobs=N] [options] <project directory or glob>...
+# Other options (e.g. --offline) are passed to every project's scripts/configure.py.
+import os
+import io
+import sys
+import glob
+import runpy
+import pathlib
+import traceback
+import contextlib
+import concurrent.futures
+
+def expand(patterns):
+    for pattern in patterns:
+        for match in sorted(glob.glob(os.path.expanduser(pattern))) or [pattern]:
+            yield pathlib.Path(match).resolve()
+
+# Returns exit status (0 on success) and captured output.
+def regenerate(project, options):
+    script = project/'scripts'/'configure.py'
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            os.chdir(project)
+            sys.argv = [str(script), *options]
+            # Every project gets fresh globals. Process-wide state is isolated by the process pool.
+            runpy.run_path(str(script), run_name='__main__')
+        return 0, output.getvalue()
+    except SystemExit as ex:
+        # Generation server and dry run exit explicitly. Only the status matters.
+        if ex.code is None or ex.code == 0:
+            return 0, output.getvalue()
+        return ex.code if isinstance(ex.code, int) else 1, output.getvalue()
+    except BaseException:
+        return None, output.getvalue() + traceback.format_exc()
+
+def main(args):
+    jobs = None
+    options = []
+    patterns = []
+    for arg in args:
+        if arg.startswith('--jobs='):
+            jobs = int(arg[len('--jobs='):])
+        elif arg.startswith('--'):
+            options.append(arg)
+        else:
+            patterns.append(arg)
+    projects = []
+    skipped = []
+    for project in expand(patterns):
+        (projects if (project/'scripts'/'configure.py').is_file() else skipped).append(project)
+    failed = []
+    exited = []
+    with concurrent.futures.ProcessPoolExecutor(jobs) as pool:
+        futures = {pool.submit(regenerate, project, options): project for project in projects}
+        for future in concurrent.futures.as_completed(futures):
+            project = futures[future]
+            status, output = future.result()
+            print(f'=== {project}')
+            print(output, end='')
+            if status is None:
+                failed.append(project)
+            elif status:
+                exited.append((project, status))
+    print()
+    print(f'Regenerated {len(projects) - len(failed) - len(exited)} of {len(projects)} projects.')
+    # Non-zero exit without exception, for example dry run that found changes.
+    for project, status in sorted(exited):
+        print(f'Changes/exit {status}: {project}')
+    for project in sorted(failed):
+        print(f'Failed: {project}')
+    for project in skipped:
+        print(f'Skipped (no scripts/configure.py): {project}')
+    return 1 if failed or exited else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,200 @@
+# Benchmarks generation of synthetic Java, .NET, and FVC projects.
+# Usage: python3 benchmark.py [--runs=N] [--save=results.json] [--baseline=results.json] [--threshold=1.25] [configure.py options]
+# Homepages are served by local stand-in server. Exit status is nonzero if any project regressed against the baseline.
+import os
+import sys
+import json
+import time
+import pathlib
+import tempfile
+import threading
+import statistics
+import subprocess
+import http.server
+
+config_directory = pathlib.Path(__file__).resolve().parent.parent
+
+HOMEPAGE = b'''<html><body>
+<aside><p>Navigation</p></aside>
+<p>Synthetic project with <code>code</code> and <a href="docs/">documentation link</a>.</p>
+</body></html>
+'''
+
+class HomepageHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == '"homepage"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('ETag', '"homepage"')
+        self.send_header('Content-Length', str(len(HOMEPAGE)))
+        self.end_headers()
+        self.wfile.write(HOMEPAGE)
+    def log_message(self, format, *args):
+        pass
+
+def configure_script(language, port, body):
+    return f'''\
+import pathlib
+project_directory = lambda: pathlib.Path(__file__).resolve().parent.parent
+config_directory = lambda: pathlib.Path({str(config_directory)!r})
+exec((config_directory()/'src'/'{language}.py').read_text())
+
+http_fetch_url = lambda url: 'http://127.0.0.1:{port}/'
+# Revalidate on every run, so that benchmark includes the round trip.
+http_cache_ttl = lambda: 0
+{body}
+generate()
+'''
+
+def java_module(directory, port):
+    packages = [f'com.machinezoo.synthmodule.part{i}' for i in range(200)]
+    source = directory/'src'/'main'/'java'
+    source.mkdir(parents=True)
+    (source/'module-info.java').write_text('\n'.join([
+        '/*',
+        ' * Synthetic module.',
+        ' */',
+        'module com.machinezoo.synthmodule {',
+        *[f'\texports {package};' for package in packages],
+        '\trequires transitive com.machinezoo.noexception;',
+        '\topens com.machinezoo.synthmodule.part0 to',
+        '\t\tcom.fasterxml.jackson.databind;',
+        '}',
+    ]) + '\n')
+    return configure_script('java', port, '''\
+pom_subgroup = lambda: 'synthmodule'
+pom_description = lambda: 'Synthetic Java module.'
+stagean_annotations = lambda: True
+jmh_benchmarks = lambda: True
+complete_javadoc = lambda: False
+def dependencies():
+    use_noexception()
+    use_guava()
+    use_jackson_cbor()
+    use_slf4j()
+    use_commons_lang()
+    use_junit()
+    use_hamcrest()
+    use_slf4j_test()
+''')
+
+def java_app(directory, port):
+    return configure_script('java', port, '''\
+main_class_name = lambda: 'App'
+is_opensource = lambda: False
+def dependencies():
+    use_slf4j()
+    use_streamex()
+''')
+
+def net_library(directory, port):
+    (directory/'SynthNet').mkdir()
+    (directory/'SynthNet'/'icon.png').write_bytes(b'')
+    return configure_script('net', port, '''\
+root_namespace = lambda: 'SynthNet'
+nuget_description = lambda: 'Synthetic .NET library.'
+extra_sln_projects = lambda: [f'SynthNet.Extra{i}' for i in range(300)]
+resources = lambda: [f'Data/resource{i}.bin' for i in range(50)]
+def dependencies():
+    use('SourceAFIS:3.14.0')
+''')
+
+def fvc_extractor(directory, port):
+    return configure_script('fvc', port, '''\
+benchmark_name = lambda: 'FV-STD-1.0'
+benchmark_abbreviation = lambda: 'STD'
+benchmark_url = lambda: 'https://biolab.csr.unibo.it/fvcongoing/'
+is_extractor_part = lambda: True
+''')
+
+def fvc_matcher(directory, port):
+    return configure_script('fvc', port, '''\
+benchmark_name = lambda: 'FV-STD-1.0'
+benchmark_abbreviation = lambda: 'STD'
+benchmark_url = lambda: 'https://biolab.csr.unibo.it/fvcongoing/'
+is_matcher_part = lambda: True
+bundled_sister_projects = lambda: ['synth-fvc-extractor']
+''')
+
+projects = {
+    'synth-java-module': java_module,
+    'synth-java-app': java_app,
+    'synth-net-library': net_library,
+    'synth-fvc-extractor': fvc_extractor,
+    'synth-fvc-matcher': fvc_matcher,
+}
+
+def create_projects(root, port):
+    for name, create in projects.items():
+        directory = root/name
+        (directory/'scripts').mkdir(parents=True)
+        (directory/'scripts'/'version.txt').write_text('1.0.0\n')
+        (directory/'scripts'/'configure.py').write_text(create(directory, port))
+
+def measure(directory, options, environment):
+    # Every run is a fresh process, so that startup cost is included. Peak memory comes from wait4().
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, 'scripts/configure.py', *options], cwd=directory, env=environment, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    elapsed = time.perf_counter() - start
+    if process.returncode:
+        raise RuntimeError(f'Generation of {directory.name} failed with status {process.returncode}.')
+    # Linux reports maxrss in kilobytes.
+    return elapsed, usage.ru_maxrss * 1024
+
+def main(args):
+    runs = 10
+    threshold = 1.25
+    save = None
+    baseline = None
+    # Outputs are always regenerated, so that the benchmark does not measure just the manifest check.
+    options = ['--full']
+    for arg in args:
+        if arg.startswith('--runs='):
+            runs = int(arg[len('--runs='):])
+        elif arg.startswith('--threshold='):
+            threshold = float(arg[len('--threshold='):])
+        elif arg.startswith('--save='):
+            save = pathlib.Path(arg[len('--save='):])
+        elif arg.startswith('--baseline='):
+            baseline = json.loads(pathlib.Path(arg[len('--baseline='):]).read_text('utf-8'))
+        else:
+            options.append(arg)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), HomepageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory(prefix='project-config-benchmark-') as temporary:
+            root = pathlib.Path(temporary)
+            create_projects(root, server.server_address[1])
+            environment = dict(os.environ, XDG_CACHE_HOME=str(root/'cache'))
+            for name in projects:
+                # Warm-up run fills the HTTP cache and the compiled code cache.
+                measure(root/name, options, environment)
+                samples = [measure(root/name, options, environment) for i in range(runs)]
+                results[name] = {
+                    'seconds': statistics.median(elapsed for elapsed, memory in samples),
+                    'memory': max(memory for elapsed, memory in samples),
+                }
+    finally:
+        server.shutdown()
+    regressions = []
+    print(f"{'project':24} {'median ms':>10} {'peak MB':>8} {'baseline ms':>12}")
+    for name, result in results.items():
+        previous = (baseline or {}).get(name)
+        reference = f"{previous['seconds'] * 1000:.1f}" if previous else '-'
+        print(f"{name:24} {result['seconds'] * 1000:10.1f} {result['memory'] / 2**20:8.1f} {reference:>12}")
+        if previous and (result['seconds'] > previous['seconds'] * threshold or result['memory'] > previous['memory'] * threshold):
+            regressions.append(name)
+    if save:
+        save.write_text(json.dumps(results, indent=2) + '\n', 'utf-8')
+    for name in regressions:
+        print(f'Regression: {name} is more than {threshold}x slower or larger than baseline.')
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,20 +1,70 @@
 import contextlib
 import textwrap
 import re
-import io
+import os
+import sys
+import json
+import time
+import hashlib
+import functools
+import types
 import pathlib
 import datetime
-import urllib.request
+import threading
 import urllib.parse
 
 # resources and constants
 resource_directory = lambda: config_directory()/'res'
 lang_directory = lambda: None
-apache_license_text = lambda: (resource_directory()/'license.txt').read_text('utf-8')
-gitignore_text = lambda: (lang_directory()/'gitignore.txt').read_text('utf-8')
-current_year = lambda: datetime.date.today().year
+apache_license_text = lambda: input_text(resource_directory()/'license.txt')
+gitignore_text = lambda: input_text(lang_directory()/'gitignore.txt')
+def current_year():
+    record_input('year')
+    return datetime.date.today().year
+
+# command line
+command_line = lambda: sys.argv[1:]
+has_option = lambda option: option in command_line()
+def option_value(option):
+    for argument in command_line():
+        if argument.startswith(option + '='):
+            return argument[len(option) + 1:]
+    return None
+
+# caches
+cache_directory = lambda: pathlib.Path(os.environ.get('XDG_CACHE_HOME') or pathlib.Path.home()/'.cache')/'project-config'
+http_cache_directory = lambda: cache_directory()/'http'
+http_cache_ttl = lambda: 24 * 60 * 60
+offline = lambda: has_option('--offline')
+# Downloads can be redirected, for example to a local stand-in server in tests.
+http_fetch_url = lambda url: url
+# Outputs are skipped when none of their inputs changed. Option --full disables this.
+incremental_generation = lambda: not has_option('--full')
+# Dry run leaves the project untouched and prints what would change instead: --dry-run (unified diff) or --dry-run=json.
+dry_run = lambda: has_option('--dry-run') or option_value('--dry-run') is not None
+dry_run_format = lambda: option_value('--dry-run') or 'diff'
+# Outputs are staged in memory and committed at the end of the run, so that failed or interrupted run leaves the project untouched.
+# Option --direct writes every output as soon as it is rendered.
+transactional_output = lambda: not has_option('--direct')
+# Option --watch keeps running after generation and regenerates outputs whenever their input files change.
+watch_mode = lambda: has_option('--watch')
+watch_poll_interval = lambda: 0.5
+# Generation is delegated to generation server (server.py) when it is running. Option --in-process disables this.
+server_socket = lambda: cache_directory()/'server.sock'
+use_server = lambda: not has_option('--in-process') and not watch_mode() and server_socket().exists()
+# Option --snapshot evaluates all settings into JSON file instead of generating outputs. Read it with snapshot.py.
+snapshot_mode = lambda: has_option('--snapshot')
+# Option --parallel renders outputs concurrently, which mostly overlaps waiting for network and disk.
+parallel_rendering = lambda: has_option('--parallel')
+# Option --profile prints time spent in outputs, settings, and I/O and writes Chrome trace (chrome://tracing) into the state directory.
+profile = lambda: has_option('--profile') or option_value('--profile') is not None
+profile_path = lambda: pathlib.Path(option_value('--profile') or state_directory()/'profile.json')
 
 # checkout
+configure_script = lambda: project_directory()/'scripts'/'configure.py'
+state_directory = lambda: project_directory()/'.project-config'
+manifest_path = lambda: state_directory()/'manifest.json'
+snapshot_path = lambda: state_directory()/'snapshot.json'
 workflows_directory = lambda: project_directory()/'.github'/'workflows'
 
 # repository
@@ -28,7 +78,7 @@ repository_dir_url = lambda path: f'{repository_url()}/tree/master/{path}'
 # general info
 pretty_name = lambda: repository_name()
 is_opensource = lambda: True
-project_version = lambda: (project_directory()/'scripts'/'version.txt').read_text('utf-8').strip()
+project_version = lambda: input_text(project_directory()/'scripts'/'version.txt').strip()
 
 # license
 inception_year = lambda: current_year()
@@ -63,41 +113,571 @@ embeddable_readme = lambda: False
 readme_url = lambda path: repository_file_url(path) if embeddable_readme() else path
 readme_dir_url = lambda path: repository_dir_url(path) if embeddable_readme() else path
 
+# Generators write into explicit writer, which is per thread, so that outputs can be rendered concurrently.
+# Process-wide sys.stdout is never redirected.
+class OutputWriter:
+    def __init__(self):
+        self.parts = []
+    def write(self, text):
+        self.parts.append(text)
+    def flush(self):
+        pass
+    def getvalue(self):
+        return ''.join(self.parts)
+
+thread_state = threading.local()
+def output():
+    return getattr(thread_state, 'writer', None) or sys.stdout
+
+@contextlib.contextmanager
+def writing_to(writer):
+    previous = getattr(thread_state, 'writer', None)
+    thread_state.writer = writer
+    try:
+        yield writer
+    finally:
+        thread_state.writer = previous
+
+# Compatibility shim for print() in generators and in overrides in configure.py, which all share these globals.
+def print(*values, sep=' ', end='\n', file=None, flush=False):
+    file = file or output()
+    file.write((' ' if sep is None else sep).join(map(str, values)) + ('\n' if end is None else end))
+    if flush:
+        file.flush()
+
 def capture_output(function):
-    f = io.StringIO()
-    with contextlib.redirect_stdout(f):
+    with writing_to(OutputWriter()) as writer:
         function()
-    return f.getvalue()
+    return writer.getvalue()
+
+http_cache = {}
+def http_get(url):
+    record_input(f'url:{url}')
+    if url in http_cache:
+        return http_cache[url]
+    path = http_cache_directory()/(hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+    # Disk cache entries are kept in warm cache, which outlives this run in generation server.
+    entries = warm_cache.setdefault('http', {})
+    entry = entries.get(url) or (json.loads(path.read_text('utf-8')) if path.exists() else None)
+    if entry and (offline() or time.time() - entry['fetched'] < http_cache_ttl()):
+        http_cache[url] = entry['body']
+        return entry['body']
+    if offline():
+        raise RuntimeError(f'Cannot download {url} in offline mode.')
+    # Imported lazily, because it is slow to import and rarely needed thanks to the cache.
+    import urllib.request
+    import urllib.error
+    request = urllib.request.Request(http_fetch_url(url))
+    if entry and entry['etag']:
+        request.add_header('If-None-Match', entry['etag'])
+    if entry and entry['last_modified']:
+        request.add_header('If-Modified-Since', entry['last_modified'])
+    try:
+        with profiling('network', url) as stats, urllib.request.urlopen(request) as response:
+            body = response.read()
+            stats['bytes'] = len(body)
+            entry = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'body': body.decode('utf-8'),
+            }
+    except urllib.error.HTTPError as ex:
+        # 304 Not Modified
+        if ex.code != 304 or not entry:
+            raise
+    except urllib.error.URLError as ex:
+        if not entry:
+            raise
+        # Plain print() would write into the generated file.
+        print(f'Using stale cached {url}: {ex.reason}', file=sys.stderr)
+        http_cache[url] = entry['body']
+        return entry['body']
+    entry['fetched'] = time.time()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Projects sharing a homepage (e.g. FVC) may refresh it concurrently in batch.py.
+    temporary = path.with_suffix(f'.{os.getpid()}.tmp')
+    temporary.write_text(json.dumps(entry), 'utf-8')
+    temporary.replace(path)
+    entries[url] = entry
+    http_cache[url] = entry['body']
+    return entry['body']
 
-homepage_html = None
 def homepage_lead():
     url = homepage()
-    global homepage_html
-    if not homepage_html:
-        homepage_html = urllib.request.urlopen(url).read().decode('utf-8')
-        homepage_html = re.sub(r'<aside.*?</aside>', '', homepage_html, flags=re.DOTALL)
-    lead = re.search(r'<p>(.*?)</p>', homepage_html, re.DOTALL).group(1)
+    html = re.sub(r'<aside.*?</aside>', '', http_get(url), flags=re.DOTALL)
+    lead = re.search(r'<p>(.*?)</p>', html, re.DOTALL).group(1)
     lead = re.sub(r'<code>(.*?)</code>', r'`\1`', lead)
     lead = re.sub(r'''<a\s+href=["']([^'"]*)["']>(.*?)</a>''', lambda m: f'[{m.group(2)}]({urllib.parse.urljoin(url, m.group(1))})', lead, 0, re.DOTALL)
     lead = re.sub(r'<.*?>', '', lead, 0, re.DOTALL)
     return lead
 
-def print_to(path, generator):
-    print(f'Generating {path}...')
+# Settings are zero-argument lambdas. They are re-evaluated whenever they are needed.
+# Memoization wraps all of them (including overrides in configure.py) to evaluate each only once per run.
+memoize_settings = lambda: has_option('--memoize')
+settings_cache = {}
+settings_cache_hits = {}
+
+def is_setting(value):
+    import inspect
+    return isinstance(value, types.LambdaType) and value.__name__ == '<lambda>' and not inspect.signature(value).parameters
+
+def memoized(name, setting):
+    def evaluate():
+        if name in settings_cache:
+            settings_cache_hits[name] = settings_cache_hits.get(name, 0) + 1
+        else:
+            # Some settings print (badges, dependencies). Their output is captured and replayed on every call.
+            with writing_to(OutputWriter()) as output:
+                value, inputs = recording_inputs(setting)
+                # Generators can be iterated only once.
+                if isinstance(value, types.GeneratorType):
+                    value, more_inputs = recording_inputs(lambda: list(value))
+                    inputs |= more_inputs
+            settings_cache[name] = (value, output.getvalue(), inputs)
+        value, output, inputs = settings_cache[name]
+        replay_inputs(inputs)
+        print(output, end='')
+        return value
+    evaluate.setting = setting
+    return evaluate
+
+def memoize_all_settings():
+    for name, value in list(globals().items()):
+        if is_setting(value):
+            globals()[name] = memoized(name, value)
+
+# Profiler records every measured section as Chrome trace event.
+profiler_active = False
+profiler_start = 0
+profile_events = []
+
+@contextlib.contextmanager
+def profiling(category, name):
+    # Measured code can add event arguments, for example byte counts, into the yielded dictionary.
+    stats = {}
+    if not profiler_active:
+        yield stats
+        return
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        end = time.perf_counter()
+        profile_events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - profiler_start) * 1_000_000,
+            'dur': (end - start) * 1_000_000,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': stats,
+        })
+
+def profiled(name, setting):
+    def evaluate():
+        with profiling('setting', name):
+            return setting()
+    evaluate.setting = setting
+    evaluate.profiled = True
+    return evaluate
+
+def profile_all_settings():
+    for name, value in list(globals().items()):
+        # Memoized settings are profiled too. Their calls are then mostly cache hits.
+        if (is_setting(value) or hasattr(value, 'setting')) and not hasattr(value, 'profiled'):
+            globals()[name] = profiled(name, value)
+
+def print_profile():
+    totals = {}
+    for event in profile_events:
+        total = totals.setdefault((event['cat'], event['name']), {'calls': 0, 'ms': 0, 'bytes': 0})
+        total['calls'] += 1
+        total['ms'] += event['dur'] / 1000
+        total['bytes'] += event['args'].get('bytes', 0)
+    for category in ['output', 'setting', 'read', 'write', 'network']:
+        ranked = sorted([(name, total) for (kind, name), total in totals.items() if kind == category], key=lambda item: -item[1]['ms'])
+        if ranked:
+            report(f'Profile of {category} ({len(ranked)} total, top 20 by time):')
+            for name, total in ranked[:20]:
+                report(f"  {total['ms']:9.3f} ms {total['calls']:6} calls {total['bytes']:9} bytes  {name}")
+    write_state(profile_path(), {'traceEvents': profile_events})
+    report(f'Profile trace written to {profile_path()}.')
+
+# Values that are expensive to compute and do not change during the run, for example parsed files.
+run_cache = {}
+def cached_per_run(key, compute):
+    if key not in run_cache:
+        run_cache[key] = recording_inputs(compute)
+        return run_cache[key][0]
+    value, inputs = run_cache[key]
+    replay_inputs(inputs)
+    return value
+
+# Every output remembers its inputs (files, URLs, current year) in the manifest.
+# Inputs are recorded while the output is rendered. Cached values replay inputs that were recorded when they were computed.
+def input_recorders():
+    if not hasattr(thread_state, 'recorders'):
+        thread_state.recorders = []
+    return thread_state.recorders
+
+def record_input(key):
+    for inputs in input_recorders():
+        inputs.add(key)
+
+def replay_inputs(inputs):
+    for recorded in input_recorders():
+        recorded |= inputs
+
+def recording_inputs(function):
+    inputs = set()
+    input_recorders().append(inputs)
+    try:
+        return function(), inputs
+    finally:
+        input_recorders().pop()
+
+# Settings that read project files should use these, so that the files are tracked as inputs.
+def input_text(path):
+    record_input(f'file:{path}')
+    with profiling('read', str(path)) as stats:
+        stat = path.stat()
+        texts = warm_cache.setdefault('text', {})
+        cached = texts.get(path)
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            text = cached[2]
+        else:
+            text = path.read_text('utf-8')
+            texts[path] = (stat.st_mtime_ns, stat.st_size, text)
+        stats['bytes'] = len(text)
+    return text
+
+def input_exists(path):
+    record_input(f'file:{path}')
+    return path.exists()
+
+# Lists project files with given suffix as sorted relative POSIX paths. Hidden directories and build outputs are not scanned.
+def list_files(suffix):
+    found = []
+    for directory, subdirectories, files in os.walk(project_directory()):
+        subdirectories[:] = sorted(name for name in subdirectories if not name.startswith('.') and name not in ('bin', 'obj', 'node_modules', 'target'))
+        found += [pathlib.Path(directory, name).relative_to(project_directory()).as_posix() for name in files if name.endswith(suffix)]
+    return sorted(found)
+
+def input_files(suffix):
+    record_input(f'files:{suffix}')
+    return list_files(suffix)
+
+def config_revision():
+    digest = hashlib.sha256()
+    for directory in [config_directory()/'src', resource_directory()]:
+        for path in sorted(directory.rglob('*')):
+            if path.is_file() and '__pycache__' not in path.parts:
+                stat = path.stat()
+                digest.update(f'{path}:{stat.st_mtime_ns}:{stat.st_size}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+def compute_fingerprint(key):
+    kind, _, target = key.partition(':')
+    if kind == 'file':
+        path = pathlib.Path(target)
+        if path.is_file():
+            with profiling('read', target) as stats:
+                content = path.read_bytes()
+                stats['bytes'] = len(content)
+            return hashlib.sha256(content).hexdigest()
+        return 'directory' if path.exists() else None
+    if kind == 'url':
+        try:
+            return hashlib.sha256(http_get(target).encode('utf-8')).hexdigest()
+        except Exception:
+            # Will fail again when the output is rendered.
+            return None
+    if kind == 'files':
+        return hashlib.sha256('\n'.join(list_files(target)).encode('utf-8')).hexdigest()
+    if kind == 'year':
+        return datetime.date.today().year
+    if kind == 'revision':
+        return config_revision()
+
+def input_fingerprint(key):
+    return cached_per_run(('fingerprint', key), lambda: compute_fingerprint(key))
+
+def output_key(path):
+    return pathlib.Path(os.path.relpath(path, project_directory())).as_posix()
+
+# Previous manifest is loaded even in --full mode, because it lists outputs that might have become obsolete.
+previous_manifest = None
+current_manifest = {}
+def output_is_current(path):
+    if not incremental_generation() or previous_manifest is None:
+        return False
+    entry = previous_manifest.get(output_key(path))
+    content = read_output(path)
+    if not entry or content is None or hashlib.sha256(content).hexdigest() != entry['hash']:
+        return False
+    return all(input_fingerprint(key) == fingerprint for key, fingerprint in entry['inputs'].items())
+
+# Some state (e.g. maven-index.json) is shared by projects. Temporary file is unique, because batch.py regenerates projects concurrently.
+def write_state(path, data):
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, 'w') as file:
-        with contextlib.redirect_stdout(file):
-            generator()
+    temporary = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    temporary.write_text(json.dumps(data, indent=2, sort_keys=True) + '\n', 'utf-8')
+    temporary.replace(path)
+
+@contextlib.contextmanager
+def generation_run():
+    run_cache.clear()
+    settings_cache.clear()
+    settings_cache_hits.clear()
+    output_stats.update(written=0, unchanged=0, skipped=0)
+    run_warnings.clear()
+    if memoize_settings():
+        memoize_all_settings()
+    global profiler_active, profiler_start, rendering_pool, previous_manifest, run_active
+    profiler_active = profile()
+    profiler_start = time.perf_counter()
+    profile_events.clear()
+    if profiler_active:
+        profile_all_settings()
+    previous_manifest = json.loads(manifest_path().read_text('utf-8'))['outputs'] if manifest_path().exists() else None
+    current_manifest.clear()
+    virtual_files.clear()
+    virtual_modes.clear()
+    if parallel_rendering():
+        # Imported only when needed, because the import alone noticeably slows down startup.
+        import concurrent.futures
+        rendering_pool = concurrent.futures.ThreadPoolExecutor()
+    else:
+        rendering_pool = None
+    pending_outputs.clear()
+    run_active = True
+    try:
+        yield
+        for future in pending_outputs.values():
+            future.result()
+        remove_obsolete_outputs()
+    finally:
+        run_active = False
+        if rendering_pool:
+            rendering_pool.shutdown()
+            rendering_pool = None
+    # Outputs are committed before the profile is printed, so that the profile includes writes.
+    if not dry_run():
+        commit_outputs()
+        write_state(manifest_path(), {'outputs': current_manifest})
+    # Caches are saved last, so that failure to save them does not discard outputs.
+    save_caches()
+    report(f"Updated {pretty_name()} configuration ({output_stats['written']} written, {output_stats['unchanged']} unchanged, {output_stats['skipped']} skipped).")
+    for warning in run_warnings:
+        print(f'Warning: {warning}', file=sys.stderr)
+    if memoize_settings():
+        report(f'Memoized {len(settings_cache)} settings with {sum(settings_cache_hits.values())} cache hits.')
+    if profiler_active:
+        profiler_active = False
+        print_profile()
+    if dry_run():
+        print_changes()
+        if virtual_files or virtual_modes:
+            sys.exit(1)
+
+# Language-specific caches are saved here once per run. Overrides should call the previous definition.
+def save_caches():
+    pass
+
+# Warnings are reported at the end of the run, so that they do not get lost among progress messages.
+run_warnings = []
+def warn(message):
+    if message not in run_warnings:
+        run_warnings.append(message)
+
+# Progress messages go to stderr in dry run, because stdout carries the diff.
+def report(message):
+    print(message, file=sys.stderr if dry_run() else sys.stdout)
+
+# In dry run and transactional mode, outputs are written to virtual filesystem overlaid over the project directory.
+# Deleted files are represented by None.
+virtual_files = {}
+virtual_modes = {}
+# Transactional mode stages only within generation_run(), which commits staged outputs.
+# Outputs of configure.py scripts that call print_to() around generate() are written directly.
+# It is a function rather than setting, so that memoization does not freeze it.
+run_active = False
+def staging_outputs():
+    return dry_run() or transactional_output() and run_active
+
+def read_output(path):
+    if path in virtual_files:
+        return virtual_files[path]
+    return path.read_bytes() if path.is_file() else None
+
+def output_matches(path, content):
+    if path in virtual_files:
+        return virtual_files[path] == content
+    return path.is_file() and path.stat().st_size == len(content) and path.read_bytes() == content
+
+def write_output(path, content):
+    if staging_outputs():
+        virtual_files[path] = content
+    else:
+        with profiling('write', str(path)) as stats:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(content)
+            stats['bytes'] = len(content)
+
+def remove_output(path):
+    if staging_outputs():
+        virtual_files[path] = None
+    else:
+        path.unlink()
 
-def print_lines(text, *, indent='', tabify=False):
+def make_executable(path):
+    wait_for_output(path)
+    # New staged files have default permissions.
+    mode = virtual_modes.get(path) or (path.stat().st_mode if path.exists() else 0o100644)
+    if mode & 0o111 != 0o111:
+        if staging_outputs():
+            virtual_modes[path] = mode | 0o111
+        else:
+            path.chmod(mode | 0o111)
+
+# Staged files are first written to temporary files next to their targets. All of them are then fsynced in one batch
+# and renamed into place. Deletions and mode changes are applied last.
+def commit_outputs():
+    staged = []
+    try:
+        for path, content in virtual_files.items():
+            if content is not None:
+                with profiling('write', str(path)) as stats:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    temporary = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+                    file = open(temporary, 'wb')
+                    staged.append((temporary, path, file))
+                    file.write(content)
+                    stats['bytes'] = len(content)
+        with profiling('write', '(fsync)'):
+            for temporary, path, file in staged:
+                file.flush()
+                os.fsync(file.fileno())
+                file.close()
+                mode = virtual_modes.get(path) or (path.stat().st_mode if path.exists() else None)
+                if mode is not None:
+                    temporary.chmod(mode & 0o7777)
+    except BaseException:
+        for temporary, path, file in staged:
+            file.close()
+            temporary.unlink(missing_ok=True)
+        raise
+    for temporary, path, file in staged:
+        temporary.replace(path)
+    for path, content in virtual_files.items():
+        if content is None and path.exists():
+            path.unlink()
+    for path, mode in virtual_modes.items():
+        if path not in virtual_files:
+            path.chmod(mode)
+    # Renames are durable only after their directories are synced. Windows cannot open directories.
+    if os.name == 'posix':
+        for directory in {path.parent for path in virtual_files}:
+            if directory.exists():
+                descriptor = os.open(directory, os.O_RDONLY)
+                try:
+                    os.fsync(descriptor)
+                finally:
+                    os.close(descriptor)
+
+def print_changes():
+    import difflib
+    changes = []
+    for path in sorted(virtual_files.keys() | virtual_modes.keys()):
+        key = output_key(path)
+        old = path.read_bytes() if path.is_file() else None
+        new = virtual_files.get(path, old)
+        if old is None:
+            change = 'created'
+        elif new is None:
+            change = 'deleted'
+        elif new != old:
+            change = 'modified'
+        else:
+            change = 'mode'
+        changes.append({'path': key, 'change': change})
+        if dry_run_format() == 'json':
+            continue
+        print(f'diff --git a/{key} b/{key}')
+        if path in virtual_modes:
+            if old is None:
+                print(f'new file mode {virtual_modes[path]:o}')
+            else:
+                print(f'old mode {path.stat().st_mode:o}')
+                print(f'new mode {virtual_modes[path]:o}')
+        if new != old:
+            old_lines = old.decode('utf-8', 'replace').splitlines(keepends=True) if old is not None else []
+            new_lines = new.decode('utf-8', 'replace').splitlines(keepends=True) if new is not None else []
+            old_name = f'a/{key}' if old is not None else '/dev/null'
+            new_name = f'b/{key}' if new is not None else '/dev/null'
+            for line in difflib.unified_diff(old_lines, new_lines, old_name, new_name):
+                print(line, end='' if line.endswith('\n') else '\n\\ No newline at end of file\n')
+    if dry_run_format() == 'json':
+        print(json.dumps({'changes': changes}, indent=2))
+
+# Outputs are rendered in the background in parallel mode. Operations on the same path wait for rendering to complete.
+rendering_pool = None
+pending_outputs = {}
+def wait_for_output(path):
+    if path in pending_outputs:
+        pending_outputs[path].result()
+
+def print_to(path, generator):
+    if rendering_pool:
+        pending_outputs[path] = rendering_pool.submit(render_to, path, generator)
+    else:
+        render_to(path, generator)
+
+# Unchanged files are not rewritten, so that their mtime does not trigger rebuilds in Maven, MSBuild, and IDEs.
+output_stats = {'written': 0, 'unchanged': 0, 'skipped': 0}
+output_stats_lock = threading.Lock()
+def count_output(result):
+    with output_stats_lock:
+        output_stats[result] += 1
+
+def render_to(path, generator):
+    with profiling('output', output_key(path)) as stats:
+        if output_is_current(path):
+            current_manifest[output_key(path)] = previous_manifest[output_key(path)]
+            count_output('skipped')
+            return
+        content, inputs = recording_inputs(lambda: capture_output(generator))
+        content = content.encode('utf-8')
+        stats['bytes'] = len(content)
+        # Every output depends on configure.py and on project-config itself.
+        inputs |= {f'file:{configure_script()}', 'revision'}
+        current_manifest[output_key(path)] = {
+            'hash': hashlib.sha256(content).hexdigest(),
+            'inputs': {key: input_fingerprint(key) for key in sorted(inputs)},
+        }
+        if output_matches(path, content):
+            count_output('unchanged')
+            return
+        report(f'Generating {path}...')
+        write_output(path, content)
+        count_output('written')
+
+# Templates are dedented, tabified, and indented only once. Fields are substituted into the cached result.
+@functools.lru_cache(maxsize=1024)
+def format_lines(text, indent, tabify):
     text = textwrap.dedent(text)
     if text[-1:] != '\n':
         text += '\n'
     if tabify:
-        for i in range(0, 5):
-            text = re.sub('^(\t*) {4}', r'\1\t', text, flags=re.MULTILINE)
-    text = textwrap.indent(text, indent)
-    print(text, end='')
+        # Converts up to 5 levels of leading 4-space indentation to tabs in one pass.
+        text = re.sub('^(\t*)((?: {4}){1,5})', lambda match: match[1] + '\t' * (len(match[2]) // 4), text, flags=re.MULTILINE)
+    return textwrap.indent(text, indent)
+
+def print_lines(text, *, indent='', tabify=False, **fields):
+    text = format_lines(text, indent, tabify)
+    output().write(text.format_map(fields) if fields else text)
 
 def notice():
     print(f"Robert Važan's {pretty_name()}")
@@ -109,18 +689,18 @@ def notice():
     ''')
 
 def contribution_guidelines():
-    print_lines(f'''\
+    print_lines('''\
         <!--- Generated by scripts/configure.py --->
-        # How to contribute to {pretty_name()}
+        # How to contribute to {name}
 
-        Thank you for taking interest in {pretty_name()}. This document provides guidance for contributors.
+        Thank you for taking interest in {name}. This document provides guidance for contributors.
 
         ## Authoritative repository
 
         Sources are mirrored on several sites. You can submit issues and pull requests on any mirror.
 
-        * [{repository_name()} @ GitHub]({github_repository_url()})
-        * [{repository_name()} @ Bitbucket]({bitbucket_repository_url()})
+        * [{repository} @ GitHub]({github})
+        * [{repository} @ Bitbucket]({bitbucket})
 
         ## Issues
 
@@ -144,8 +724,19 @@ def contribution_guidelines():
 
         ## License
 
-        Your submissions will be distributed under [{license_name()}](LICENSE).
-    ''')
+        Your submissions will be distributed under [{license}](LICENSE).
+    ''', name=pretty_name(), repository=repository_name(), github=github_repository_url(), bitbucket=bitbucket_repository_url(), license=license_name())
+
+# Optional sections are rendered only once, because user overrides might be expensive or have side effects.
+# Layout around the section is then decided from the buffered output.
+def print_section(text):
+    if text:
+        print()
+        print(text, end='')
+
+def print_documentation_links():
+    for title, url in documentation_links():
+        print(f'* [{title}]({url})')
 
 def readme():
     print('<!--- Generated by scripts/configure.py --->')
@@ -153,12 +744,11 @@ def readme():
         print('[![SWUbanner](https://raw.githubusercontent.com/vshymanskyy/StandWithUkraine/main/banner2-direct.svg)](https://github.com/vshymanskyy/StandWithUkraine/blob/main/docs/README.md)')
         print()
     print(f'# {pretty_name()}')
-    if capture_output(badges):
-        print()
-        badges()
-    if md_description():
+    print_section(capture_output(badges))
+    description = md_description()
+    if description:
         print()
-        print_lines(md_description())
+        print_lines(description)
     print()
     print('## Status')
     print()
@@ -170,16 +760,13 @@ def readme():
 
             See [homepage]({homepage()}).
         ''')
-    if list(documentation_links()) or capture_output(documentation_comment):
+    links = capture_output(print_documentation_links)
+    comment = capture_output(documentation_comment)
+    if links or comment:
         print()
         print('## Documentation')
-        if list(documentation_links()):
-            print()
-            for title, url in documentation_links():
-                print(f'* [{title}]({url})')
-        if capture_output(documentation_comment):
-            print()
-            documentation_comment()
+        print_section(links)
+        print_section(comment)
     elif is_opensource():
         print()
         print_lines(f'''\
@@ -206,6 +793,219 @@ def license():
     print(license_text(), end='')
 
 def remove_obsolete(path):
-    if path.exists():
-        print(f'Removing obsolete {path}...')
-        path.unlink()
+    wait_for_output(path)
+    if read_output(path) is not None:
+        report(f'Removing obsolete {path}...')
+        remove_output(path)
+
+# Files generated by old versions of project-config, which did not keep the manifest.
+legacy_outputs = lambda: []
+
+# Outputs listed in previous manifest that were not generated in this run are removed.
+# Files that were edited since they were generated are left alone.
+def remove_obsolete_outputs():
+    if previous_manifest is None:
+        for path in legacy_outputs():
+            remove_obsolete(path)
+        return
+    for key in sorted(previous_manifest.keys() - current_manifest.keys()):
+        path = project_directory()/key
+        content = read_output(path)
+        if content is not None:
+            if hashlib.sha256(content).hexdigest() == previous_manifest[key]['hash']:
+                report(f'Removing obsolete {path}...')
+                remove_output(path)
+            else:
+                warn(f'{path} is no longer generated, but it was modified, so it was not removed.')
+
+# Dependencies passed to use() are recorded while snapshot is taken.
+declared_dependencies = None
+def declare_dependency(coordinates, **details):
+    if declared_dependencies is not None:
+        declared_dependencies.append({'coordinates': coordinates, **{key: value for key, value in details.items() if value}})
+
+# Converts setting value to JSON-compatible data. Values that cannot be represented in JSON (e.g. functions) raise TypeError.
+def snapshot_value(value):
+    def convert(item):
+        if isinstance(item, pathlib.PurePath):
+            return str(item)
+        if isinstance(item, (set, frozenset, types.GeneratorType)):
+            return list(item)
+        raise TypeError(f'Cannot store {item!r} in snapshot.')
+    return json.loads(json.dumps(value, default=convert))
+
+# Snapshot covers lambda settings and settings written as functions, because they need statements. Language modules add theirs.
+function_settings = {'current_year', 'common_documentation_links'}
+# Settings that describe invocation or this machine rather than the project. Snapshot key does not cover them, so they are left out.
+# Actions like use_*() and dependency lists are left out too. Dependencies are recorded separately.
+runtime_settings = {
+    'command_line', 'cache_directory', 'http_cache_directory', 'http_cache_ttl', 'offline', 'incremental_generation',
+    'dry_run', 'dry_run_format', 'transactional_output', 'watch_mode', 'watch_poll_interval', 'server_socket',
+    'snapshot_mode', 'parallel_rendering', 'profile', 'profile_path', 'memoize_settings',
+}
+def snapshot_settings():
+    for name, value in sorted(globals().items()):
+        if name in runtime_settings or name.startswith('use_') or name in ['dependencies', 'test_dependencies']:
+            continue
+        if is_setting(value) or name in function_settings and callable(value):
+            yield name, value
+
+# Snapshot holds value of every setting together with fingerprints of inputs that were read while evaluating them.
+# Settings that fail (e.g. module_name in non-modular project) are left out. Printed output stands in for missing return value.
+def take_snapshot():
+    global declared_dependencies
+    settings = {}
+    inputs = {f'file:{configure_script()}', 'revision'}
+    for name, setting in snapshot_settings():
+        try:
+            with writing_to(OutputWriter()) as output:
+                value, setting_inputs = recording_inputs(lambda: snapshot_value(setting()))
+            settings[name] = output.getvalue() if value is None and output.getvalue() else value
+            inputs |= setting_inputs
+        except Exception:
+            pass
+    declared_dependencies = []
+    try:
+        for generator in dependency_generators():
+            generator_inputs = recording_inputs(lambda: capture_output(generator))[1]
+            inputs |= generator_inputs
+        dependencies = declared_dependencies
+    finally:
+        declared_dependencies = None
+    fingerprints = {key: input_fingerprint(key) for key in sorted(inputs)}
+    write_state(snapshot_path(), {
+        'key': hashlib.sha256(json.dumps(fingerprints, sort_keys=True).encode('utf-8')).hexdigest(),
+        'config': str(config_directory()),
+        'inputs': fingerprints,
+        'settings': settings,
+        'dependencies': dependencies,
+    })
+    report(f'Saved snapshot of {len(settings)} settings and {len(dependencies)} dependencies to {snapshot_path()}.')
+
+# Watched files are the file inputs recorded in the manifest, which covers configure.py, version.txt, module-info.java, icons, etc.
+def watched_files():
+    files = {configure_script()}
+    for entry in current_manifest.values():
+        files |= {pathlib.Path(key[len('file:'):]) for key in entry['inputs'] if key.startswith('file:')}
+    return files
+
+def watched_directories(files):
+    directories = set()
+    for path in files:
+        directory = path.parent
+        # Watching nearest existing ancestor catches creation of missing files like module-info.java.
+        while not directory.is_dir() and directory != directory.parent:
+            directory = directory.parent
+        directories.add(directory)
+    for directory in [config_directory()/'src', resource_directory()]:
+        directories |= {path for path in [directory, *directory.rglob('*')] if path.is_dir() and '__pycache__' not in path.parts}
+    return directories
+
+def watch_snapshot(files):
+    snapshot = {'revision': config_revision()}
+    for path in files:
+        try:
+            stat = path.stat()
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            snapshot[path] = None
+    return snapshot
+
+# Returns inotify descriptor watching given directories or None if inotify is not available and polling must be used.
+def start_inotify(directories):
+    import ctypes
+    import ctypes.util
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        descriptor = libc.inotify_init1(os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if descriptor < 0:
+        return None
+    # IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE
+    mask = 0x2 | 0x4 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200
+    for directory in directories:
+        if libc.inotify_add_watch(descriptor, os.fsencode(directory), mask) < 0:
+            os.close(descriptor)
+            return None
+    return descriptor
+
+def wait_for_changes(descriptor):
+    import select
+    if descriptor is None:
+        time.sleep(watch_poll_interval())
+        return
+    select.select([descriptor], [], [])
+    # Editors and version control tools touch files in bursts. Events are drained after a short pause.
+    time.sleep(0.05)
+    while select.select([descriptor], [], [], 0)[0]:
+        os.read(descriptor, 65536)
+
+def watch_changes():
+    import traceback
+    files = watched_files()
+    snapshot = watch_snapshot(files)
+    report('Watching for changes. Press Ctrl+C to stop.')
+    try:
+        while True:
+            descriptor = start_inotify(watched_directories(files))
+            try:
+                current = watch_snapshot(files)
+                while current == snapshot:
+                    wait_for_changes(descriptor)
+                    current = watch_snapshot(files)
+            finally:
+                if descriptor is not None:
+                    os.close(descriptor)
+            # Changed configure.py or project-config code cannot be reloaded in-process.
+            if current[configure_script()] != snapshot[configure_script()] or current['revision'] != snapshot['revision']:
+                report('Restarting after change in configure.py or project-config...')
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os.execv(sys.executable, [sys.executable, *sys.argv])
+            try:
+                with generation_run():
+                    generate_files()
+            except Exception:
+                # Transactional output leaves the project untouched. Next change will be tried again.
+                traceback.print_exc()
+            else:
+                files = watched_files()
+            # Files are compared against their state before regeneration, so that changes made during regeneration are not missed.
+            snapshot = {**watch_snapshot(files), **{path: current[path] for path in files if path in current}, 'revision': current['revision']}
+    except KeyboardInterrupt:
+        pass
+
+# Thin client for generation server. Returns exit status or None if the server is not available.
+def generate_on_server():
+    import socket
+    connection = socket.socket(socket.AF_UNIX)
+    try:
+        connection.connect(str(server_socket()))
+    except OSError:
+        connection.close()
+        return None
+    with connection:
+        request = {'script': str(configure_script()), 'directory': os.getcwd(), 'arguments': command_line()}
+        connection.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        for line in connection.makefile('r', encoding='utf-8'):
+            message = json.loads(line)
+            if 'exit' in message:
+                return message['exit']
+            stream = sys.stderr if message['stream'] == 'stderr' else sys.stdout
+            stream.write(message['text'])
+    # Server died mid-request. Transactional output makes it safe to generate again in-process.
+    return None
+
+def generate():
+    if use_server():
+        status = generate_on_server()
+        if status is not None:
+            sys.exit(status)
+    if snapshot_mode():
+        take_snapshot()
+        return
+    with generation_run():
+        generate_files()
+    if watch_mode():
+        watch_changes()
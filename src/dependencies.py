@@ -0,0 +1,119 @@
+# Index of dependencies declared via use() across many projects.
+# Usage: python3 dependencies.py [--jobs=N] [--index=path] [--uses=coordinates] [--setting=name] [project directory or glob]...
+# Listed projects are (re)indexed first. Only projects whose snapshot (see snapshot.py) is out of date are re-evaluated.
+# Without query options, prints every dependency with its versions and projects.
+# Option --uses=group:artifact[:version] (or package[:version] for .NET) lists projects using the dependency.
+# Option --setting=name lists projects with value of the setting and dependencies that use the value as their version,
+# e.g. --setting=jmh_version shows which projects are affected when jmh_version is bumped.
+import os
+import sys
+import json
+import pathlib
+import subprocess
+import concurrent.futures
+import snapshot
+from batch import expand
+
+default_index = pathlib.Path(os.environ.get('XDG_CACHE_HOME') or pathlib.Path.home()/'.cache')/'project-config'/'dependency-index.json'
+
+def scan(project):
+    # Snapshot is taken by configure.py itself, so that all overrides and use() calls are captured.
+    process = subprocess.run([sys.executable, 'scripts/configure.py', '--snapshot'], cwd=project, capture_output=True, text=True)
+    if process.returncode:
+        return None, process.stderr
+    return describe_snapshot(snapshot.load(project)), None
+
+def describe_snapshot(taken):
+    return {
+        'key': taken['key'],
+        'dependencies': taken['dependencies'],
+        'settings': taken['settings'],
+    }
+
+# Snapshot fingerprints cover configure.py, project-config itself (e.g. new jackson_version), and every other input of settings.
+# Current snapshot is indexed without running configure.py. Index entries are keyed by snapshot, so that changes are counted.
+def update(index, projects, jobs):
+    stale = []
+    changed = 0
+    for project in projects:
+        if not (project/'scripts'/'configure.py').is_file():
+            print(f'Skipped (no scripts/configure.py): {project}', file=sys.stderr)
+            continue
+        taken = snapshot.load(project)
+        if taken and snapshot.is_current(project, taken):
+            changed += index['projects'].get(str(project), {}).get('key') != taken['key']
+            index['projects'][str(project)] = describe_snapshot(taken)
+        else:
+            stale.append(project)
+    with concurrent.futures.ThreadPoolExecutor(jobs) as pool:
+        for project, (entry, error) in zip(stale, pool.map(scan, stale)):
+            if entry is None:
+                print(f'Failed: {project}', file=sys.stderr)
+                print(error, end='', file=sys.stderr)
+            else:
+                index['projects'][str(project)] = entry
+    return changed + len(stale)
+
+# Coordinates are split into dependency identity (group:artifact or package) and version, which is always the last part.
+def split_coordinates(coordinates):
+    identity, _, version = coordinates.rpartition(':')
+    return identity, version
+
+def usages(index):
+    for project, entry in sorted(index['projects'].items()):
+        for dependency in entry['dependencies']:
+            identity, version = split_coordinates(dependency['coordinates'])
+            yield identity, version, project, dependency
+
+def describe(dependency):
+    details = [dependency[key] for key in ['scope', 'classifier'] if key in dependency]
+    details += ['excludes ' + exclusion for exclusion in dependency.get('exclusions', [])]
+    return f" ({', '.join(details)})" if details else ''
+
+def main(args):
+    jobs = None
+    path = default_index
+    uses = None
+    setting = None
+    patterns = []
+    for arg in args:
+        if arg.startswith('--jobs='):
+            jobs = int(arg[len('--jobs='):])
+        elif arg.startswith('--index='):
+            path = pathlib.Path(arg[len('--index='):])
+        elif arg.startswith('--uses='):
+            uses = arg[len('--uses='):]
+        elif arg.startswith('--setting='):
+            setting = arg[len('--setting='):]
+        else:
+            patterns.append(arg)
+    index = json.loads(path.read_text('utf-8')) if path.exists() else {'projects': {}}
+    if patterns:
+        scanned = update(index, list(expand(patterns)), jobs)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(index, indent=2, sort_keys=True) + '\n', 'utf-8')
+        temporary.replace(path)
+        print(f'Indexed {scanned} changed of {len(index["projects"])} projects.', file=sys.stderr)
+    if uses:
+        for identity, version, project, dependency in usages(index):
+            if uses in [identity, f'{identity}:{version}']:
+                print(f'{project} {version}{describe(dependency)}')
+    elif setting:
+        for project, entry in sorted(index['projects'].items()):
+            if setting in entry['settings']:
+                value = entry['settings'][setting]
+                affected = [dependency['coordinates'] for dependency in entry['dependencies'] if split_coordinates(dependency['coordinates'])[1] == str(value)]
+                print(f"{project} {json.dumps(value)}{': ' + ', '.join(affected) if affected else ''}")
+    else:
+        versions = {}
+        for identity, version, project, dependency in usages(index):
+            versions.setdefault(identity, {}).setdefault(version, []).append(project)
+        for identity, projects in sorted(versions.items()):
+            print(identity)
+            for version, names in sorted(projects.items()):
+                print(f'\t{version}: {", ".join(pathlib.Path(name).name for name in names)}')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,146 @@
+load_source('lang/net.py')
+
+# Snapshot (see take_snapshot() in common.py)
+function_settings |= {'documentation_links'}
+runtime_settings |= {'package_mode'}
+
+benchmark_name = lambda: None
+benchmark_abbreviation = lambda: None
+benchmark_url = lambda: None
+is_extractor_part = lambda: False
+is_matcher_part = lambda: False
+is_multipart_submission = lambda: is_extractor_part() or is_matcher_part()
+bundled_sister_projects = lambda: []
+has_submission_zip = lambda: not is_multipart_submission() or bundled_sister_projects()
+submission_zip = lambda: f'sourceafis-fvc-{benchmark_abbreviation().lower()}.zip'
+submission_path = lambda: project_directory()/root_namespace()/'bin'/submission_zip()
+# Compressed zip members keyed by SHA-256 of their content, so that unchanged files are not compressed again.
+submission_cache = lambda: state_directory()/'submission'
+# Publish outputs of sister projects go first, so that files of this project win in case of name collision.
+submission_sources = lambda: [*(project_directory().parent/project for project in bundled_sister_projects()), project_directory()]
+# Option --package builds the submission zip from outputs of dotnet publish instead of generating configuration.
+package_mode = lambda: has_option('--package')
+
+subdomain = lambda: 'sourceafis'
+homepage = lambda: website() + 'fvc'
+is_library = lambda: False
+assembly_name = lambda: 'enroll' if is_extractor_part() else 'match'
+namespace_suffix = lambda: '.Extractor' if is_extractor_part() else '.Matcher' if is_matcher_part() else ''
+root_namespace = lambda: f'SourceAFIS.FVC.{benchmark_abbreviation()}{namespace_suffix()}'
+name_suffix = lambda: ' extractor' if is_extractor_part() else ' matcher' if is_matcher_part() else ''
+pretty_name = lambda: f'SourceAFIS{name_suffix()} for FVC {benchmark_abbreviation()}'
+md_description = lambda: f'''\
+	Submission of [SourceAFIS](https://sourceafis.machinezoo.com/){name_suffix()}
+	to [{benchmark_name()}]({benchmark_url()}) benchmark
+	in [FVC-onGoing](https://biolab.csr.unibo.it/FVCOnGoing/UI/Form/Home.aspx) competition.
+
+	More on [homepage]({homepage()}).
+'''
+
+def documentation_links():
+    yield from standard_documentation_links()
+    yield 'SourceAFIS overview', 'https://sourceafis.machinezoo.com/'
+    yield f'FVC-onGoing {benchmark_abbreviation()} benchmark', benchmark_url()
+
+def dependencies():
+    use('SourceAFIS:3.14.0')
+
+def publish_script():
+    print('#/bin/sh -e')
+    print('# Generated by scripts/configure.py')
+    print('cd `dirname $0`/..')
+    print('dotnet publish -c release -r win-x86')
+    if has_submission_zip():
+        print('python3 scripts/configure.py --package')
+
+def submission_members():
+    members = {}
+    for source in submission_sources():
+        for path in sorted(source.glob('*/bin/Release/net*/win-x86/publish/*')):
+            if path.is_file():
+                members[path.name] = path
+    return dict(sorted(members.items()))
+
+def compress_member(path, content):
+    import zlib
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+    compressed = compressor.compress(content) + compressor.flush()
+    temporary = path.with_suffix(f'.{threading.get_ident()}.tmp')
+    temporary.write_bytes(compressed)
+    temporary.replace(path)
+
+# Zip is written directly, because zipfile cannot store precompressed data. Output is deterministic:
+# members are sorted by name and have fixed timestamp (1980-01-01) and permissions.
+def write_submission(path, members, identity):
+    import struct
+    timestamp = (0, (1 << 5) | 1)
+    central = []
+    temporary = path.with_name(path.name + '.tmp')
+    with open(temporary, 'wb') as file:
+        for name, digest, crc, size in members:
+            encoded = name.encode('utf-8')
+            data = (submission_cache()/f'{digest}.deflate').read_bytes()
+            offset = file.tell()
+            file.write(struct.pack('<IHHHHHIIIHH', 0x04034b50, 20, 0x800, 8, *timestamp, crc, len(data), size, len(encoded), 0) + encoded)
+            file.write(data)
+            central.append(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, 0x314, 20, 0x800, 8, *timestamp, crc, len(data), size, len(encoded), 0, 0, 0, 0, 0o100644 << 16, offset) + encoded)
+        start = file.tell()
+        for record in central:
+            file.write(record)
+        comment = identity.encode('ascii')
+        file.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, len(central), len(central), file.tell() - start, start, len(comment)) + comment)
+    temporary.replace(path)
+
+# Identity is the zip comment at the very end of the file. Only that much is read.
+def submission_identity(path, length):
+    try:
+        with open(path, 'rb') as file:
+            file.seek(-length, os.SEEK_END)
+            return file.read(length)
+    except OSError:
+        # Missing file or file shorter than the comment.
+        return None
+
+def package_submission():
+    import zlib
+    import concurrent.futures
+    submission_cache().mkdir(parents=True, exist_ok=True)
+    members = []
+    compressions = []
+    with concurrent.futures.ThreadPoolExecutor() as pool:
+        # Compression runs in parallel, because zlib releases GIL.
+        for name, path in submission_members().items():
+            content = path.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+            members.append((name, digest, zlib.crc32(content), len(content)))
+            if not (submission_cache()/f'{digest}.deflate').exists():
+                compressions.append(pool.submit(compress_member, submission_cache()/f'{digest}.deflate', content))
+    for compression in compressions:
+        compression.result()
+    # Zip comment identifies member list and contents. Unchanged zip is not rewritten.
+    identity = hashlib.sha256(json.dumps(members).encode('utf-8')).hexdigest()
+    if submission_identity(submission_path(), len(identity)) == identity.encode('ascii'):
+        report(f'Submission {submission_path()} is up to date.')
+    else:
+        submission_path().parent.mkdir(parents=True, exist_ok=True)
+        write_submission(submission_path(), members, identity)
+        report(f'Packaged {len(members)} files into {submission_path()}.')
+    used = {f'{digest}.deflate' for name, digest, crc, size in members}
+    for cached in submission_cache().iterdir():
+        if cached.name not in used:
+            cached.unlink()
+
+generate_net_files = generate_files
+generate_configuration = generate
+
+def generate_files():
+    ps = project_directory()/'scripts'/'publish.sh'
+    print_to(ps, publish_script)
+    make_executable(ps)
+    generate_net_files()
+
+def generate():
+    if package_mode():
+        package_submission()
+    else:
+        generate_configuration()
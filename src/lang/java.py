@@ -0,0 +1,801 @@
+load_source('common.py')
+
+import collections
+
+# Snapshot (see take_snapshot() in common.py)
+function_settings |= {'javadoc_home', 'maven_options', 'standard_javadoc_links', 'standard_badges', 'standard_documentation_links', 'documentation_comment'}
+runtime_settings |= {'maven_repository', 'maven_index_path', 'validate_dependencies', 'report_newer_versions', 'compared_benchmarks', 'accepted_benchmarks', 'test_timings'}
+
+# resources and constants
+lang_directory = lambda: resource_directory()/'java'
+
+# repository
+scm_connection = lambda: f'scm:git:{repository_url()}.git'
+
+# maven coordinates
+pom_subgroup = lambda: repository_name()
+pom_group = lambda: 'com.machinezoo.' + pom_subgroup()
+pom_artifact = lambda: repository_name()
+# Coordinates passed to use() are checked against local Maven repository, which can be also pointed to a mirror directory.
+maven_repository = lambda: pathlib.Path.home()/'.m2'/'repository'
+maven_index_path = lambda: cache_directory()/'maven-index.json'
+validate_dependencies = lambda: maven_repository().is_dir()
+report_newer_versions = lambda: has_option('--outdated')
+
+# website
+subdomain = lambda: pom_subgroup()
+javadoc_site = lambda: website() + 'javadoc/'
+def javadoc_home():
+    if not is_module():
+        return javadoc_site()
+    if is_multi_package():
+        return javadoc_site() + module_name() + '/module-summary.html'
+    return javadoc_site() + module_name() + '/' + main_package_path() + '/package-summary.html'
+
+# project info
+pom_name = lambda: pretty_name()
+pom_description = lambda: None
+
+# code structure
+module_info_path = lambda: project_directory()/'src'/'main'/'java'/'module-info.java'
+module_info_text = lambda: input_text(module_info_path())
+module_info = lambda: cached_per_run(('module-info', module_info_path()), lambda: parsed_module_info(module_info_text()) if input_exists(module_info_path()) else None)
+module_info_matches = lambda pattern: [x.group(1) for x in re.finditer(pattern, module_info_text(), re.MULTILINE)]
+is_module = lambda: module_info() is not None
+module_name = lambda: module_info().name
+main_package = lambda: module_name() if is_module() else 'com.machinezoo.' + pom_artifact().replace('-', '.')
+main_package_path = lambda: main_package().replace('.', '/')
+main_class_name = lambda: None
+main_class = lambda: main_package() + '.' + main_class_name() if main_class_name() else None
+is_library = lambda: main_class() is None
+exported_packages = lambda: [package for package, targets in module_info().exports.items() if not targets]
+is_multi_package = lambda: is_module() and len(exported_packages()) > 1
+
+# build features
+jdk_version = lambda: 11
+jdk_preview = lambda: False
+jdk_parameter_names = lambda: False
+maven_central = lambda: is_library() and is_opensource()
+test_coverage = lambda: maven_central()
+has_javadoc = lambda: maven_central()
+complete_javadoc = lambda: has_javadoc()
+jmh_benchmarks = lambda: False
+# Script scripts/benchmark.sh stores JMH results (JSON) in results/ subdirectory and compares them against baseline.json.
+jmh_results_directory = lambda: project_directory()/'benchmarks'
+jmh_baseline_path = lambda: jmh_results_directory()/'baseline.json'
+# Relative slowdown that is reported as regression. Individual benchmarks can have their own thresholds in jmh_thresholds.
+jmh_regression_threshold = lambda: 0.1
+jmh_thresholds = lambda: {}
+# Option --compare-benchmarks=results.json compares results against baseline. Option --accept-benchmarks=results.json makes them the new baseline.
+compared_benchmarks = lambda: option_value('--compare-benchmarks')
+accepted_benchmarks = lambda: option_value('--accept-benchmarks')
+stagean_annotations = lambda: False
+# Parallel tests. Option parallel_tests runs test classes concurrently in one JVM via JUnit 5.
+# Surefire forks (e.g. '1C' for one per core) are an alternative for tests that are not thread-safe.
+parallel_tests = lambda: False
+surefire_fork_count = lambda: None
+surefire_reuse_forks = lambda: None
+# Surefire runOrder, e.g. 'random' to detect order dependencies between test classes.
+surefire_run_order = lambda: None
+junit_parallel = lambda: parallel_tests()
+junit_parallel_classes_mode = lambda: 'concurrent'
+junit_parallel_methods_mode = lambda: 'same_thread'
+# Threads per core.
+junit_parallel_factor = lambda: 1
+junit_platform_properties_path = lambda: project_directory()/'src'/'test'/'resources'/'junit-platform.properties'
+# Option --test-timings lists slowest test classes from Surefire reports of the last build.
+test_timings = lambda: has_option('--test-timings')
+test_timings_limit = lambda: 20
+# Maven build speed. All of it is opt-in, because generated files in .mvn/ replace any hand-written ones.
+# Files in .mvn/ are generated only when they have some content.
+# Parallel builds, e.g. '1C' for one thread per core.
+maven_threads = lambda: None
+# For example ['-XX:+UseParallelGC', '-XX:TieredStopAtLevel=1'] speeds up short builds.
+maven_jvm_options = lambda: []
+# Maven build cache extension requires Maven 3.9+. Release workflow always disables the cache.
+maven_build_cache = lambda: False
+maven_build_cache_version = lambda: '1.2.0'
+# Defaults to ~/.m2/build-cache.
+maven_build_cache_directory = lambda: None
+def maven_options():
+    if maven_threads():
+        yield '-T' + maven_threads()
+    if maven_build_cache() and maven_build_cache_directory():
+        yield f'-Dmaven.build.cache.location={maven_build_cache_directory()}'
+
+# dependencies
+dependencies = lambda: None
+javadoc_links = lambda: standard_javadoc_links()
+
+# readme
+md_description_fallback = lambda: pom_description()
+stagean_notice = lambda: ' [Stagean](https://stagean.machinezoo.com/) is used to track progress on class and method level.' if stagean_annotations() else ''
+stable_status = lambda: 'Stable and maintained.' + stagean_notice()
+experimental_status = lambda: 'Experimental.' + stagean_notice()
+
+# Parsed module-info.java. Requires map module to modifiers. Exports and opens map package to target modules.
+ModuleInfo = collections.namedtuple('ModuleInfo', ['name', 'is_open', 'requires', 'exports', 'opens', 'uses', 'provides'])
+module_info_token = re.compile(r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\])*"|([\w.$]+|[^\s\w])', re.DOTALL)
+
+def parse_module_info(text):
+    # Single pass over tokens. Comments, string literals, and annotations are skipped.
+    header = []
+    directives = None
+    directive = []
+    annotation = False
+    parentheses = 0
+    for match in module_info_token.finditer(text):
+        token = match.group(1)
+        if token is None:
+            continue
+        if parentheses:
+            parentheses += {'(': 1, ')': -1}.get(token, 0)
+        elif token == '(':
+            parentheses = 1
+        elif token == '@':
+            annotation = True
+        elif annotation:
+            annotation = False
+        elif directives is None:
+            if token == '{':
+                directives = []
+            elif token == ';':
+                # Import statements.
+                header = []
+            else:
+                header.append(token)
+        elif token == ';':
+            if directive:
+                directives.append(directive)
+            directive = []
+        elif token == '}':
+            break
+        elif token != ',':
+            directive.append(token)
+    info = ModuleInfo(header[-1], 'open' in header, {}, {}, {}, [], {})
+    for keyword, *arguments in directives or []:
+        if keyword == 'requires':
+            info.requires[arguments[-1]] = arguments[:-1]
+        elif keyword == 'exports':
+            info.exports[arguments[0]] = arguments[2:]
+        elif keyword == 'opens':
+            info.opens[arguments[0]] = arguments[2:]
+        elif keyword == 'uses':
+            info.uses.append(arguments[0])
+        elif keyword == 'provides':
+            info.provides[arguments[0]] = arguments[2:]
+    return info
+
+# Generation server keeps parsed module-info.java in warm cache, keyed by its text.
+def parsed_module_info(text):
+    parsed = warm_cache.setdefault('module-info', {})
+    if text not in parsed:
+        parsed[text] = parse_module_info(text)
+    return parsed[text]
+
+def use_xml(xml):
+    print_pom(2, xml)
+
+# Maps artifact directory to its mtime and list of versions with a POM. Entries are refreshed when the directory changes.
+maven_index = None
+maven_index_dirty = False
+
+def maven_versions(group, artifact):
+    global maven_index, maven_index_dirty
+    if maven_index is None:
+        maven_index = json.loads(maven_index_path().read_text('utf-8')) if maven_index_path().exists() else {}
+    directory = maven_repository().joinpath(*group.split('.'), artifact)
+    try:
+        mtime = directory.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
+    key = str(directory)
+    entry = maven_index.get(key)
+    if not entry or entry['mtime'] != mtime:
+        versions = [child.name for child in directory.iterdir() if (child/f'{artifact}-{child.name}.pom').exists()]
+        entry = maven_index[key] = {'mtime': mtime, 'versions': sorted(versions, key=maven_version_key)}
+        maven_index_dirty = True
+    return entry['versions']
+
+# Approximates Maven version ordering: numbers compare numerically and qualified versions (1.0-beta) precede releases (1.0).
+def maven_version_key(version):
+    return [(2, int(token), '') if token.isdigit() else (0, 0, token.lower()) for token in re.findall(r'\d+|[a-zA-Z]+', version)] + [(1, 0, '')]
+
+def is_prerelease(version):
+    return re.search(r'(?i)snapshot|alpha|beta|rc|-m\d', version) is not None
+
+def validate_dependency(group, artifact, version):
+    versions = maven_versions(group, artifact)
+    # Version directory might have gained its POM without changing mtime of the artifact directory.
+    if version not in versions and not (maven_repository().joinpath(*group.split('.'), artifact, version)/f'{artifact}-{version}.pom').exists():
+        if versions:
+            warn(f'Dependency {group}:{artifact}:{version} is not in local Maven repository. Available versions: {", ".join(versions)}.')
+        else:
+            warn(f'Dependency {group}:{artifact} is not in local Maven repository.')
+    elif report_newer_versions():
+        newer = [other for other in versions if maven_version_key(other) > maven_version_key(version) and (is_prerelease(version) or not is_prerelease(other))]
+        if newer:
+            warn(f'Dependency {group}:{artifact}:{version} can be updated to {newer[-1]}.')
+
+save_common_caches = save_caches
+def save_caches():
+    global maven_index_dirty
+    save_common_caches()
+    if maven_index_dirty:
+        write_state(maven_index_path(), maven_index)
+        maven_index_dirty = False
+
+def use(dependency, scope=None, *, classifier=None, exclusions=[]):
+    group, artifact, version = dependency.split(':')
+    declare_dependency(dependency, scope=scope, classifier=classifier, exclusions=exclusions)
+    if validate_dependencies():
+        validate_dependency(group, artifact, version)
+    print_pom(2, '''\
+        <dependency>
+            <groupId>{group}</groupId>
+            <artifactId>{artifact}</artifactId>
+            <version>{version}</version>
+    ''', group=group, artifact=artifact, version=version)
+    if scope:
+        print_pom(3, '<scope>{scope}</scope>', scope=scope)
+    if classifier:
+        print_pom(3, '<classifier>{classifier}</classifier>', classifier=classifier)
+    if exclusions:
+        print_pom(3, '<exclusions>')
+        for exclusion in exclusions:
+            ex_group, ex_artifact = exclusion.split(':')
+            print_pom(4, '''\
+                <exclusion>
+                    <groupId>{group}</groupId>
+                    <artifactId>{artifact}</artifactId>
+                </exclusion>
+            ''', group=ex_group, artifact=ex_artifact)
+        print_pom(3, '</exclusions>')
+    print_pom(2, '</dependency>')
+
+def define_use(dependency):
+    return lambda *args, **kwargs: use(dependency, *args, **kwargs)
+
+use_stagean = define_use('com.machinezoo.stagean:stagean:1.2.0')
+use_noexception = define_use('com.machinezoo.noexception:noexception:1.8.0')
+use_hookless = define_use('com.machinezoo.hookless:hookless:0.14.4')
+use_pushmode = define_use('com.machinezoo.pushmode:pushmode:0.8.2')
+use_pmsite = define_use('com.machinezoo.pmsite:pmsite:0.18.4')
+use_pmdata = define_use('com.machinezoo.pmdata:pmdata:0.12.4')
+
+use_slf4j = define_use('org.slf4j:slf4j-api:1.7.32')
+use_streamex = define_use('one.util:streamex:0.8.1')
+use_fastutil = define_use('it.unimi.dsi:fastutil:8.5.6')
+use_commons_lang = define_use('org.apache.commons:commons-lang3:3.12.0')
+use_commons_collections = define_use('org.apache.commons:commons-collections4:4.4')
+use_commons_math = define_use('org.apache.commons:commons-math3:3.6.1')
+use_commons_io = define_use('commons-io:commons-io:2.11.0')
+use_guava = define_use('com.google.guava:guava:31.0.1-jre')
+use_gson = define_use('com.google.code.gson:gson:2.8.9')
+jackson_version = lambda: '2.13.3'
+use_jackson = define_use(f'com.fasterxml.jackson.core:jackson-databind:{jackson_version()}')
+def use_jackson_cbor():
+    use_jackson()
+    use(f'com.fasterxml.jackson.dataformat:jackson-dataformat-cbor:{jackson_version()}')
+jmh_version = lambda: '1.34'
+def use_jmh():
+    use(f'org.openjdk.jmh:jmh-core:{jmh_version()}')
+    use(f'org.openjdk.jmh:jmh-generator-annprocess:{jmh_version()}')
+
+def use_junit(): use('org.junit.jupiter:junit-jupiter:5.8.2', 'test')
+def use_hamcrest(): use('org.hamcrest:hamcrest:2.2', 'test')
+def use_mockito(): use('org.mockito:mockito-core:4.2.0', 'test')
+def use_slf4j_test(): use('com.github.valfirst:slf4j-test:2.3.0', 'test')
+
+def standard_javadoc_links():
+    if stagean_annotations():
+        yield 'https://stagean.machinezoo.com/javadoc/'
+
+def standard_badges():
+    if maven_central():
+        print(f'[![Maven Central](https://img.shields.io/maven-central/v/{pom_group()}/{pom_artifact()})](https://search.maven.org/artifact/{pom_group()}/{pom_artifact()})')
+    if is_opensource():
+        print(f'[![Build status]({github_repository_url()}/workflows/build/badge.svg)]({github_repository_url()}/actions/workflows/build.yml)')
+    if test_coverage():
+        print(f'[![Test coverage](https://codecov.io/gh/robertvazan/{repository_name()}/branch/master/graph/badge.svg)](https://codecov.io/gh/robertvazan/{repository_name()})')
+
+def standard_documentation_links():
+    yield from common_documentation_links()
+    if has_javadoc():
+        yield 'Javadoc', javadoc_home()
+
+def documentation_comment():
+    if is_library() and not complete_javadoc():
+        if has_javadoc():
+            print(f'Some APIs are undocumented. You might have to peek in the [source code](src/main/java/{main_package_path()}).')
+        else:
+            print(f'There is no javadoc yet. See [source code](src/main/java/{main_package_path()}) for available APIs.')
+
+# Generators that call use(). Snapshot renders them to collect dependencies.
+dependency_generators = lambda: [pom]
+
+def print_pom(indent, text, **fields):
+    print_lines(text, indent=indent * '\t', tabify=True, **fields)
+
+def build_workflow():
+    print_lines(f'''\
+        # Generated by scripts/configure.py
+        name: build
+        on:
+          push:
+            branches: [ master ]
+          pull_request:
+            branches: [ master ]
+          workflow_dispatch:
+        jobs:
+          build:
+            uses: robertvazan/project-config/.github/workflows/java-build.yml@master
+            with:
+              java-version: {jdk_version()}
+              test-coverage: {'true' if test_coverage() else 'false'}
+    ''')
+
+def release_workflow():
+    # GitHub Actions cannot run the whole release procedure.
+    # Releases are initiated by running a script on developer machine, which then triggers this workflow via REST API.
+    print_lines(f'''\
+        # Generated by scripts/configure.py
+        name: release
+        on: workflow_dispatch
+        jobs:
+          release:
+            uses: robertvazan/project-config/.github/workflows/java-release.yml@master
+            with:
+              java-version: {jdk_version()}
+            secrets:
+              server-password: ${{{{ secrets.MAVEN_SERVER_PASSWORD }}}}
+              signing-key: ${{{{ secrets.MAVEN_SIGNING_KEY }}}}
+              signing-password: ${{{{ secrets.MAVEN_SIGNING_PASSWORD }}}}
+    ''')
+
+def pom():
+    print_pom(0, '''\
+        <!-- Generated by scripts/configure.py -->
+        <project xmlns="http://maven.apache.org/POM/4.0.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+            xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 http://maven.apache.org/xsd/maven-4.0.0.xsd">
+            <modelVersion>4.0.0</modelVersion>
+
+            <groupId>{group}</groupId>
+            <artifactId>{artifact}</artifactId>
+            <version>{version}</version>
+
+            <name>{name}</name>
+    ''', group=pom_group(), artifact=pom_artifact(), version=project_version(), name=pom_name())
+    if pom_description():
+        print_pom(1, '<description>{description}</description>', description=pom_description())
+    print_pom(1, '''
+        <url>{url}</url>
+        <inceptionYear>{inception}</inceptionYear>
+    ''', url=homepage() if has_website() else repository_url(), inception=inception_year())
+    if is_opensource():
+        print()
+        print_pom(1, '''\
+            <licenses>
+                <license>
+                    <name>{id}</name>
+                    <url>{url}</url>
+                </license>
+            </licenses>
+        ''', id=license_id(), url=license_url())
+    print()
+    print_pom(1, '''\
+        <organization>
+            <name>Robert Važan</name>
+            <url>https://robert.machinezoo.com/</url>
+        </organization>
+        <developers>
+            <developer>
+                <name>Robert Važan</name>
+                <email>robert.vazan@tutanota.com</email>
+                <url>https://robert.machinezoo.com/</url>
+            </developer>
+        </developers>
+    ''')
+    if is_opensource():
+        print()
+        print_pom(1, '''\
+            <scm>
+                <connection>{connection}</connection>
+                <developerConnection>{connection}</developerConnection>
+                <url>{url}</url>
+            </scm>
+        ''', connection=scm_connection(), url=repository_url())
+    print()
+    print_pom(1, '''\
+        <properties>
+            <project.build.sourceEncoding>UTF-8</project.build.sourceEncoding>
+            <maven.compiler.release>{jdk}</maven.compiler.release>
+    ''', jdk=jdk_version())
+    if main_class():
+        print_pom(2, '<exec.mainClass>{module}{main}</exec.mainClass>', module=module_name() + '/' if is_module() else '', main=main_class())
+    print_pom(1, '''\
+        </properties>
+
+        <dependencies>
+    ''')
+    if stagean_annotations():
+        use_stagean()
+    dependencies()
+    if jmh_benchmarks():
+        use_jmh()
+    print_pom(1, '''\
+        </dependencies>
+
+        <build>
+    ''')
+    if input_exists(project_directory()/'src'/'main'/'filtered'):
+        print_pom(2, '''\
+            <resources>
+                <resource>
+                    <directory>src/main/filtered</directory>
+                    <filtering>true</filtering>
+                </resource>
+            </resources>
+        ''')
+    # Needed for Java 11+.
+    # Contains fix for https://issues.apache.org/jira/browse/MCOMPILER-289
+    print_pom(2, '''\
+        <plugins>
+            <plugin>
+                <artifactId>maven-compiler-plugin</artifactId>
+                <version>3.8.1</version>
+    ''')
+    if jdk_preview() or jdk_parameter_names() or jmh_benchmarks():
+        print_pom(4, '<configuration>')
+        if jdk_preview() or jdk_parameter_names():
+            print_pom(5, '<compilerArgs>')
+            if jdk_preview():
+                print_pom(6, '<compilerArg>--enable-preview</compilerArg>')
+            if jdk_parameter_names():
+                print_pom(6, '<compilerArg>-parameters</compilerArg>')
+            print_pom(5, '</compilerArgs>')
+        if jmh_benchmarks():
+            # Annotation processors are not picked from classpath, because there is nothing on the classpath in Java 9+.
+            # We have to list them here. Otherwise we get the dreaded "Unable to get public no-arg constructor" error.
+            print_pom(5, '''\
+                <annotationProcessorPaths>
+                    <path>
+                        <groupId>org.openjdk.jmh</groupId>
+                        <artifactId>jmh-generator-annprocess</artifactId>
+                        <version>{version}</version>
+                    </path>
+                </annotationProcessorPaths>
+            ''', version=jmh_version())
+        print_pom(4, '</configuration>')
+    # Needed for Java 17+.
+    print_pom(3, '''\
+        </plugin>
+        <plugin>
+            <artifactId>maven-surefire-plugin</artifactId>
+            <version>3.0.0-M5</version>
+    ''')
+    if jdk_preview() or surefire_fork_count() or surefire_reuse_forks() is not None or surefire_run_order():
+        print_pom(4, '<configuration>')
+        if jdk_preview():
+            print_pom(5, '<argLine>--enable-preview</argLine>')
+        if surefire_fork_count():
+            print_pom(5, '<forkCount>{count}</forkCount>', count=surefire_fork_count())
+        if surefire_reuse_forks() is not None:
+            print_pom(5, '<reuseForks>{reuse}</reuseForks>', reuse=str(surefire_reuse_forks()).lower())
+        if surefire_run_order():
+            print_pom(5, '<runOrder>{order}</runOrder>', order=surefire_run_order())
+        print_pom(4, '</configuration>')
+    print_pom(3, '</plugin>')
+    if test_coverage():
+        # JaCoCo plugin is needed to generate Codecov report.
+        # Configuration taken from: https://github.com/codecov/example-java/blob/master/pom.xml#L38-L56
+        print_pom(3, '''\
+            <plugin>
+                <groupId>org.jacoco</groupId>
+                <artifactId>jacoco-maven-plugin</artifactId>
+                <version>0.8.7</version>
+                <executions>
+                    <execution>
+                        <id>prepare-agent</id>
+                        <goals>
+                            <goal>prepare-agent</goal>
+                        </goals>
+                    </execution>
+                    <execution>
+                        <id>report</id>
+                        <phase>test</phase>
+                        <goals>
+                            <goal>report</goal>
+                        </goals>
+                    </execution>
+                </executions>
+            </plugin>
+        ''')
+    # In order to release to Maven Central, javadoc has to be generated even if it is empty.
+    if has_javadoc() or maven_central():
+        print_pom(3, '''\
+            <plugin>
+                <groupId>org.apache.maven.plugins</groupId>
+                <artifactId>maven-javadoc-plugin</artifactId>
+                <version>3.3.1</version>
+                <configuration>
+                    <notimestamp>true</notimestamp>
+        ''')
+        if not complete_javadoc() and jdk_version() >= 17:
+            print_pom(5, '<doclint>all,-missing</doclint>')
+        print_pom(5, '''\
+            <bottom>
+                <![CDATA[<!-- No copyright message. -->]]>
+            </bottom>
+        ''')
+        links = list(javadoc_links())
+        if links:
+            # Explicit link list, because detectLinks would cause every CI build to fail.
+            # CI build is configured to fail on javadoc warnings and we want to keep that.
+            print_pom(5, '<links>')
+            for link in links:
+                print_pom(6, '<link>{link}</link>', link=link)
+            print_pom(5, '</links>')
+        print_pom(3, '''\
+                </configuration>
+                <executions>
+                    <execution>
+                        <id>attach-javadocs</id>
+                        <goals>
+                            <goal>jar</goal>
+                        </goals>
+                    </execution>
+                </executions>
+            </plugin>
+        ''')
+    if maven_central():
+        # Maven Central releases require source, javadoc, staging, and gpg plugins.
+        # Nexus does two-phase staging deployment, which is not supported by maven-deploy-plugin.
+        print_pom(3, '''\
+            <plugin>
+                <groupId>org.apache.maven.plugins</groupId>
+                <artifactId>maven-source-plugin</artifactId>
+                <version>3.0.1</version>
+                <executions>
+                    <execution>
+                        <id>attach-sources</id>
+                        <goals>
+                            <goal>jar-no-fork</goal>
+                        </goals>
+                    </execution>
+                </executions>
+            </plugin>
+            <plugin>
+                <groupId>org.sonatype.plugins</groupId>
+                <artifactId>nexus-staging-maven-plugin</artifactId>
+                <version>1.6.8</version>
+                <extensions>true</extensions>
+                <configuration>
+                    <serverId>ossrh</serverId>
+                    <nexusUrl>https://oss.sonatype.org/</nexusUrl>
+                    <autoReleaseAfterClose>true</autoReleaseAfterClose>
+                </configuration>
+        ''')
+        if jdk_version() >= 17:
+            # Bugs OSSRH-66257 and NEXUS-26993.
+            print_pom(4, '''\
+                <dependencies>
+                    <dependency>
+                        <groupId>com.thoughtworks.xstream</groupId>
+                        <artifactId>xstream</artifactId>
+                        <version>1.4.15</version>
+                    </dependency>
+                </dependencies>
+            ''')
+        print_pom(3, '''\
+            </plugin>
+            <plugin>
+                <groupId>org.apache.maven.plugins</groupId>
+                <artifactId>maven-gpg-plugin</artifactId>
+                <version>1.6</version>
+                <configuration>
+                    <gpgArguments>
+                        <arg>--pinentry-mode</arg>
+                        <arg>loopback</arg>
+                    </gpgArguments>
+                </configuration>
+                <executions>
+                    <execution>
+                        <id>sign-artifacts</id>
+                        <phase>verify</phase>
+                        <goals>
+                            <goal>sign</goal>
+                        </goals>
+                    </execution>
+                </executions>
+            </plugin>
+        ''')
+    if jmh_benchmarks():
+        # Required by JMH architecture. Benchmarks must be compiled into an independent executable JAR file.
+        # Filter prevents failure when shading signed dependencies: https://stackoverflow.com/a/6743609
+        print_pom(3, '''\
+            <plugin>
+                <groupId>org.apache.maven.plugins</groupId>
+                <artifactId>maven-shade-plugin</artifactId>
+                <version>3.2.3</version>
+                <executions>
+                    <execution>
+                        <phase>package</phase>
+                        <goals>
+                            <goal>shade</goal>
+                        </goals>
+                        <configuration>
+                            <outputFile>target/${project.artifactId}-jmh.jar</outputFile>
+                            <transformers>
+                                <transformer implementation="org.apache.maven.plugins.shade.resource.ServicesResourceTransformer" />
+                                <transformer implementation="org.apache.maven.plugins.shade.resource.ManifestResourceTransformer">
+                                    <mainClass>org.openjdk.jmh.Main</mainClass>
+                                </transformer>
+                            </transformers>
+                            <filters>
+                                <filter>
+                                    <artifact>*:*</artifact>
+                                    <excludes>
+                                        <exclude>META-INF/*.SF</exclude>
+                                        <exclude>META-INF/*.DSA</exclude>
+                                        <exclude>META-INF/*.RSA</exclude>
+                                    </excludes>
+                                </filter>
+                            </filters>
+                        </configuration>
+                    </execution>
+                </executions>
+            </plugin>
+        ''')
+    print_pom(0, '''\
+                </plugins>
+            </build>
+        </project>
+    ''')
+
+legacy_outputs = lambda: [project_directory()/'.travis.yml', workflows_directory()/'maven-release.yml']
+
+# Neither maven.config nor jvm.config supports comments. One option per line.
+def maven_config():
+    for option in maven_options():
+        print(option)
+
+def maven_jvm_config():
+    for option in maven_jvm_options():
+        print(option)
+
+def maven_extensions():
+    print_pom(0, '''\
+        <?xml version="1.0" encoding="UTF-8"?>
+        <!-- Generated by scripts/configure.py -->
+        <extensions xmlns="http://maven.apache.org/EXTENSIONS/1.1.0" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+            xsi:schemaLocation="http://maven.apache.org/EXTENSIONS/1.1.0 https://maven.apache.org/xsd/core-extensions-1.1.0.xsd">
+            <extension>
+                <groupId>org.apache.maven.extensions</groupId>
+                <artifactId>maven-build-cache-extension</artifactId>
+                <version>{version}</version>
+            </extension>
+        </extensions>
+    ''', version=maven_build_cache_version())
+
+def junit_platform_properties():
+    print_lines('''\
+        # Generated by scripts/configure.py
+        junit.jupiter.execution.parallel.enabled=true
+        junit.jupiter.execution.parallel.mode.classes.default={classes}
+        junit.jupiter.execution.parallel.mode.default={methods}
+        junit.jupiter.execution.parallel.config.strategy=dynamic
+        junit.jupiter.execution.parallel.config.dynamic.factor={factor}
+    ''', classes=junit_parallel_classes_mode(), methods=junit_parallel_methods_mode(), factor=junit_parallel_factor())
+
+def print_test_timings():
+    import xml.etree.ElementTree
+    reports = sorted((project_directory()/'target'/'surefire-reports').glob('TEST-*.xml'))
+    if not reports:
+        print('No Surefire reports found. Run the tests first.')
+        return
+    suites = []
+    for report in reports:
+        suite = xml.etree.ElementTree.parse(report).getroot()
+        suites.append((float(suite.get('time', 0)), suite.get('name'), int(suite.get('tests', 0))))
+    suites.sort(reverse=True)
+    total = sum(time for time, name, tests in suites)
+    for time, name, tests in suites[:test_timings_limit()]:
+        print(f'{time:8.2f}s {time / total if total else 0:6.1%} {tests:5} tests  {name}')
+    print(f'{total:8.2f}s total in {len(suites)} test classes')
+
+def benchmark_script():
+    results = pathlib.Path(os.path.relpath(jmh_results_directory(), project_directory())).as_posix()
+    print('#!/bin/sh -e')
+    print('# Generated by scripts/configure.py')
+    print('# Runs JMH benchmarks and compares results against baseline. Arguments are passed to JMH, e.g. benchmark filter.')
+    print(f'# Results can be made the new baseline with: scripts/configure.py --accept-benchmarks={results}/results/<timestamp>.json')
+    print('cd `dirname $0`/..')
+    print('mvn -q package -DskipTests')
+    print(f'mkdir -p {results}/results')
+    print(f'result={results}/results/`date -u +%Y%m%dT%H%M%SZ`.json')
+    print(f'java -jar target/{pom_artifact()}-jmh.jar -rf json -rff $result "$@"')
+    print('python3 scripts/configure.py --compare-benchmarks=$result')
+
+# Benchmarks are identified by name and parameters. Values are (mode, score, error, unit).
+def benchmark_scores(path):
+    scores = {}
+    for result in json.loads(path.read_text('utf-8')):
+        parameters = ','.join(f'{key}={value}' for key, value in sorted(result.get('params', {}).items()))
+        metric = result['primaryMetric']
+        # Error cannot be estimated from too few iterations. JMH then writes string "NaN" or omits it. It is treated as zero.
+        try:
+            error = float(metric.get('scoreError'))
+        except (TypeError, ValueError):
+            error = 0
+        scores[result['benchmark'] + (f'({parameters})' if parameters else '')] = (result['mode'], metric['score'], error if error == error else 0, metric['scoreUnit'])
+    return scores
+
+def accept_benchmarks(path):
+    jmh_baseline_path().parent.mkdir(parents=True, exist_ok=True)
+    jmh_baseline_path().write_bytes(path.read_bytes())
+    print(f'Saved {path} as benchmark baseline.')
+
+# Returns number of regressions. Differences within error margins are treated as noise.
+def compare_benchmarks(path):
+    if not jmh_baseline_path().exists():
+        accept_benchmarks(path)
+        return 0
+    baseline = benchmark_scores(jmh_baseline_path())
+    regressions = 0
+    for name, (mode, score, error, unit) in benchmark_scores(path).items():
+        if name not in baseline or baseline[name][0] != mode or baseline[name][3] != unit:
+            print(f'{name}: {score:.3f} {unit} (no baseline)')
+            continue
+        _, previous, previous_error, _ = baseline[name]
+        # Relative change is undefined when zero throughput or zero time is the reference.
+        # Any difference then means zero throughput now or nonzero time where there was none, i.e. regression.
+        if not (score if mode == 'thrpt' else previous):
+            regressions += score != previous
+            print(f"{name}: {previous:.3f} -> {score:.3f} {unit} (not comparable){' REGRESSION' if score != previous else ''}")
+            continue
+        # Throughput is better when higher. Other modes measure time, which is better when lower.
+        slowdown = (previous / score if mode == 'thrpt' else score / previous) - 1
+        threshold = jmh_thresholds().get(name.partition('(')[0], jmh_regression_threshold())
+        regressed = slowdown > threshold and abs(score - previous) > error + previous_error
+        regressions += regressed
+        print(f"{name}: {previous:.3f} -> {score:.3f} {unit} ({slowdown:+.1%} slower){' REGRESSION' if regressed else ''}")
+    print(f'Found {regressions} regressions against {jmh_baseline_path()}.')
+    return regressions
+
+def generate_files():
+    print_to(project_directory()/'.gitignore', gitignore)
+    if is_opensource():
+        print_to(project_directory()/'LICENSE', license)
+        print_to(project_directory()/'NOTICE', notice)
+        print_to(workflows_directory()/'build.yml', build_workflow)
+    if maven_central():
+        print_to(workflows_directory()/'release.yml', release_workflow)
+    print_to(project_directory()/'pom.xml', pom)
+    if list(maven_options()):
+        print_to(project_directory()/'.mvn'/'maven.config', maven_config)
+    if junit_parallel():
+        print_to(junit_platform_properties_path(), junit_platform_properties)
+    if maven_jvm_options():
+        print_to(project_directory()/'.mvn'/'jvm.config', maven_jvm_config)
+    if maven_build_cache():
+        print_to(project_directory()/'.mvn'/'extensions.xml', maven_extensions)
+    if is_opensource():
+        print_to(project_directory()/'CONTRIBUTING.md', contribution_guidelines)
+    print_to(project_directory()/'README.md', readme)
+    if jmh_benchmarks():
+        bs = project_directory()/'scripts'/'benchmark.sh'
+        print_to(bs, benchmark_script)
+        make_executable(bs)
+
+generate_configuration = generate
+
+def generate():
+    if compared_benchmarks():
+        sys.exit(1 if compare_benchmarks(pathlib.Path(compared_benchmarks())) else 0)
+    elif accepted_benchmarks():
+        accept_benchmarks(pathlib.Path(accepted_benchmarks()))
+    elif test_timings():
+        print_test_timings()
+    else:
+        generate_configuration()
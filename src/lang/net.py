@@ -0,0 +1,273 @@
+load_source('common.py')
+
+import collections
+
+# Snapshot (see take_snapshot() in common.py)
+function_settings |= {'sln_projects', 'standard_badges', 'standard_documentation_links'}
+
+# resources and constants
+lang_directory = lambda: resource_directory()/'net'
+
+# general info
+pretty_name = lambda: root_namespace()
+
+# project info
+nuget_title = lambda: pretty_name()
+nuget_description = lambda: None
+nuget_tags = lambda: None
+nuget_icon = lambda: 'icon.png' if input_exists(project_directory()/root_namespace()/'icon.png') else None
+
+# code structure
+is_library = lambda: True
+root_namespace = lambda: repository_name()
+extra_sln_projects = lambda: []
+# Adds every *.csproj found in the repository to the solution.
+sln_discovery = lambda: False
+# Solution entries are either project names (Name/Name.csproj) or paths to .csproj files.
+# Directories above project directory become solution folders.
+def sln_projects():
+    yield root_namespace()
+    if has_tests():
+        yield f'{root_namespace()}.Tests'
+    yield from extra_sln_projects()
+    if sln_discovery():
+        yield from input_files('.csproj')
+resources = lambda: []
+test_resources = lambda: []
+
+# build features
+target_framework = lambda: '5.0' if is_library() else '6.0'
+nuget_release = lambda: is_library() and is_opensource()
+has_tests = lambda: is_library()
+assembly_name = lambda: root_namespace()
+
+# dependencies
+dependencies = lambda: None
+def standard_test_dependencies():
+    use_nunit()
+    use_nunit_adapter()
+    use_mstest()
+test_dependencies = lambda: standard_test_dependencies()
+
+# readme
+md_description_fallback = lambda: nuget_description()
+embeddable_readme = lambda: True
+def standard_badges():
+    if nuget_release():
+        print(f'[![Nuget](https://img.shields.io/nuget/v/{root_namespace()})](https://www.nuget.org/packages/{root_namespace()}/)')
+    if is_opensource():
+        print(f'[![Build status]({github_repository_url()}/workflows/build/badge.svg)]({github_repository_url()}/actions/workflows/build.yml)')
+def standard_documentation_links():
+    yield from common_documentation_links()
+    if is_library():
+        yield 'XML doc comments', readme_dir_url(root_namespace())
+
+def use_xml(xml): print_csproj(2, xml)
+def use(dependency):
+    package, version = dependency.split(':')
+    declare_dependency(dependency)
+    print_csproj(2, '<PackageReference Include="{package}" Version="{version}" />', package=package, version=version)
+def define_use(dependency): return lambda: use(dependency)
+use_nunit = define_use('NUnit:3.13.3')
+use_nunit_adapter = define_use('NUnit3TestAdapter:4.2.1')
+use_mstest = define_use('Microsoft.NET.Test.Sdk:17.2.0')
+
+def build_workflow():
+    print_lines(f'''\
+        # Generated by scripts/configure.py
+        name: build
+        on:
+          push:
+            branches: [ master ]
+          pull_request:
+            branches: [ master ]
+          workflow_dispatch:
+        jobs:
+          build:
+            uses: robertvazan/project-config/.github/workflows/net-build.yml@master
+            with:
+              dotnet-version: {target_framework()}.x
+    ''')
+
+def release_workflow():
+    # GitHub Actions cannot run the whole release procedure.
+    # Releases are initiated by running a script on developer machine, which then triggers this workflow via REST API.
+    print_lines(f'''\
+        # Generated by scripts/configure.py
+        name: release
+        on: workflow_dispatch
+        jobs:
+          release:
+            uses: robertvazan/project-config/.github/workflows/net-release.yml@master
+            with:
+              dotnet-version: {target_framework()}.x
+            secrets:
+              nuget-token: ${{{{ secrets.NUGET_TOKEN }}}}
+    ''')
+
+# Generators that call use(). Snapshot renders them to collect dependencies.
+dependency_generators = lambda: [csproj, test_csproj] if has_tests() else [csproj]
+
+def print_csproj(indent, text, **fields):
+    print_lines(text, indent=indent * '  ', **fields)
+
+def csproj():
+    print_lines('''\
+        <!-- Generated by scripts/configure.py -->
+        <Project Sdk="Microsoft.NET.Sdk">
+          <PropertyGroup>
+            <TargetFramework>net{framework}</TargetFramework>
+            <Version>{version}</Version>
+            <Title>{title}</Title>
+    ''', framework=target_framework(), version=project_version(), title=nuget_title())
+    if not is_library():
+        print_csproj(2, '<OutputType>Exe</OutputType>')
+    if assembly_name() != root_namespace():
+        print_csproj(2, '<AssemblyName>{name}</AssemblyName>', name=assembly_name())
+    if nuget_release():
+        print_csproj(2, '''\
+            <Authors>robertvazan</Authors>
+            <RepositoryUrl>{repository}</RepositoryUrl>
+            <PackageProjectUrl>{homepage}</PackageProjectUrl>
+            <PackageLicenseExpression>{license}</PackageLicenseExpression>
+            <PackageReadmeFile>README.md</PackageReadmeFile>
+        ''', repository=repository_url(), homepage=homepage() if has_website() else repository_url(), license=license_id())
+        if nuget_description():
+            print_csproj(2, '<Description>{description}</Description>', description=nuget_description())
+        if nuget_tags():
+            print_csproj(2, '<PackageTags>{tags}</PackageTags>', tags=nuget_tags())
+        if nuget_icon():
+            print_csproj(2, '<PackageIcon>{icon}</PackageIcon>', icon=nuget_icon())
+    else:
+        print_csproj(2, '<IsPackable>false</IsPackable>')
+    if is_library():
+        print_csproj(2, '<GenerateDocumentationFile>true</GenerateDocumentationFile>')
+    print_csproj(1, '</PropertyGroup>')
+    if has_tests():
+        print_csproj(1, '''\
+            <ItemGroup>
+                <InternalsVisibleTo Include="{namespace}.Tests" />
+            </ItemGroup>
+        ''', namespace=root_namespace())
+    if nuget_release() or resources():
+        print_csproj(1, '<ItemGroup>')
+        if nuget_release():
+            print_csproj(2, '<None Include="../README.md" Pack="true" PackagePath="/" />')
+            if nuget_icon():
+                print_csproj(2, '<None Include="{icon}" Pack="true" PackagePath="/" />', icon=nuget_icon())
+        if resources():
+            for resource in resources():
+                print_csproj(2, '<EmbeddedResource Include="{resource}" />', resource=resource)
+        print_csproj(1, '</ItemGroup>')
+    references = capture_output(dependencies)
+    if references:
+        print_csproj(1, '<ItemGroup>')
+        print(references, end='')
+        print_csproj(1, '</ItemGroup>')
+    print('</Project>')
+
+def test_csproj():
+    print_lines('''\
+        <!-- Generated by scripts/configure.py -->
+        <Project Sdk="Microsoft.NET.Sdk">
+          <PropertyGroup>
+            <TargetFramework>net{framework}</TargetFramework>
+            <IsPackable>false</IsPackable>
+            <RootNamespace>{namespace}</RootNamespace>
+          </PropertyGroup>
+          <ItemGroup>
+            <ProjectReference Include="../{namespace}/{namespace}.csproj" />
+          </ItemGroup>
+          <ItemGroup>
+    ''', framework=target_framework(), namespace=root_namespace())
+    test_dependencies()
+    print_csproj(1, '</ItemGroup>')
+    if test_resources():
+        print_csproj(1, '<ItemGroup>')
+        for resource in test_resources():
+            print_csproj(2, '<EmbeddedResource Include="{resource}" />', resource=resource)
+        print_csproj(1, '</ItemGroup>')
+    print('</Project>')
+
+SlnProject = collections.namedtuple('SlnProject', ['name', 'path', 'guid', 'folder'])
+sln_folder_type = '2150E333-8FDC-42A3-9474-1A3956D46DE8'
+
+# Resolves solution entries to projects and folders. Every GUID is computed only once. Duplicates (e.g. discovered main project) are dropped.
+def resolve_sln_projects():
+    import uuid
+    author = uuid.uuid5(uuid.NAMESPACE_DNS, 'machinezoo.com')
+    repository = uuid.uuid5(author, repository_name())
+    projects = {}
+    for entry in sln_projects():
+        path = pathlib.PurePosixPath(entry if entry.endswith('.csproj') else f'{entry}/{pathlib.PurePosixPath(entry).name}.csproj')
+        if path not in projects:
+            # Projects in the flat layout keep GUIDs derived from their name.
+            key = path.stem if path == pathlib.PurePosixPath(path.stem, path.name) else str(path)
+            folder = path.parent.parent.as_posix()
+            projects[path] = SlnProject(path.stem, str(path), uuid.uuid5(repository, key), '' if folder == '.' else folder)
+    folders = {}
+    for project in projects.values():
+        folder = project.folder
+        while folder and folder not in folders:
+            folders[folder] = uuid.uuid5(repository, 'folder:' + folder)
+            folder = folder.rpartition('/')[0]
+    return list(projects.values()), folders
+
+def sln():
+    projects, folders = resolve_sln_projects()
+    print_lines('''\
+        # Generated by scripts/configure.py
+        Microsoft Visual Studio Solution File, Format Version 12.00
+    ''')
+    for project in projects:
+        print_lines('''\
+            Project("{{{guid}}}") = "{name}", "{path}", "{{{guid}}}"
+            EndProject
+        ''', guid=project.guid, name=project.name, path=project.path)
+    for folder, folder_guid in sorted(folders.items()):
+        print_lines('''\
+            Project("{{{type}}}") = "{name}", "{name}", "{{{guid}}}"
+            EndProject
+        ''', type=sln_folder_type, name=folder.rpartition('/')[2], guid=folder_guid)
+    print_lines('''\
+        Global
+            GlobalSection(SolutionConfigurationPlatforms) = preSolution
+                Debug|Any CPU = Debug|Any CPU
+                Release|Any CPU = Release|Any CPU
+            EndGlobalSection
+            GlobalSection(ProjectConfigurationPlatforms) = postSolution
+    ''', tabify=True)
+    for project in projects:
+        print_lines('''\
+            {{{guid}}}.Debug|Any CPU.ActiveCfg = Debug|Any CPU
+            {{{guid}}}.Debug|Any CPU.Build.0 = Debug|Any CPU
+            {{{guid}}}.Release|Any CPU.ActiveCfg = Release|Any CPU
+            {{{guid}}}.Release|Any CPU.Build.0 = Release|Any CPU
+        ''', indent='\t\t', guid=project.guid)
+    print_lines('EndGlobalSection', indent='\t')
+    if folders:
+        print_lines('GlobalSection(NestedProjects) = preSolution', indent='\t')
+        nesting = [(project.guid, project.folder) for project in projects if project.folder]
+        nesting += [(folder_guid, folder.rpartition('/')[0]) for folder, folder_guid in sorted(folders.items()) if '/' in folder]
+        for child, parent in nesting:
+            print_lines('{{{child}}} = {{{parent}}}', indent='\t\t', child=child, parent=folders[parent])
+        print_lines('EndGlobalSection', indent='\t')
+    print_lines('EndGlobal')
+
+legacy_outputs = lambda: [workflows_directory()/'nuget-release.yml', project_directory()/root_namespace()/'AssemblyInfo.cs']
+
+def generate_files():
+    print_to(project_directory()/'.gitignore', gitignore)
+    if is_opensource():
+        print_to(project_directory()/'LICENSE', license)
+        print_to(project_directory()/'NOTICE', notice)
+        print_to(workflows_directory()/'build.yml', build_workflow)
+    if nuget_release():
+        print_to(workflows_directory()/'release.yml', release_workflow)
+    print_to(project_directory()/root_namespace()/f'{root_namespace()}.csproj', csproj)
+    if has_tests():
+        print_to(project_directory()/f'{root_namespace()}.Tests'/f'{root_namespace()}.Tests.csproj', test_csproj)
+    print_to(project_directory()/f'{root_namespace()}.sln', sln)
+    if is_opensource():
+        print_to(project_directory()/'CONTRIBUTING.md', contribution_guidelines)
+    print_to(project_directory()/'README.md', readme)
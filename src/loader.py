@@ -0,0 +1,38 @@
+import os
+import sys
+import marshal
+
+# Generation server (server.py) passes the same warm cache to every run. Standalone runs start with an empty one.
+if 'warm_cache' not in globals():
+    warm_cache = {}
+
+# Sources of project-config are compiled once and cached in __pycache__, keyed by path, mtime, and size.
+def load_source(name):
+    path = config_directory()/'src'/name
+    stat = path.stat()
+    # Code is compiled with the same resolved path, so that tracebacks from cached code name the actual file.
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    compiled = warm_cache.setdefault('code', {})
+    if key in compiled:
+        exec(compiled[key], globals())
+        return
+    cache = path.parent/'__pycache__'/f'{path.stem}.{sys.implementation.cache_tag}.code'
+    try:
+        cached_key, code = marshal.loads(cache.read_bytes())
+        # Code cached by older versions might have been compiled with unresolved path.
+        if cached_key != key or code.co_filename != key[0]:
+            code = None
+    except (OSError, EOFError, ValueError, TypeError):
+        code = None
+    if code is None:
+        code = compile(path.read_bytes(), key[0], 'exec')
+        try:
+            cache.parent.mkdir(exist_ok=True)
+            temporary = cache.with_suffix(f'.{os.getpid()}.tmp')
+            temporary.write_bytes(marshal.dumps((key, code)))
+            temporary.replace(cache)
+        except OSError:
+            # Read-only checkout. Just skip caching.
+            pass
+    compiled[key] = code
+    exec(code, globals())
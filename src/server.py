@@ -0,0 +1,94 @@
+# Generation server keeping project-config compiled and its caches warm between runs of scripts/configure.py.
+# Usage: python3 server.py [--socket=path]
+# While the server is running, scripts/configure.py forwards its command line to the server and relays output.
+# Requests are served one at a time, because generation changes process-wide state (working directory, sys.argv, stdout).
+import os
+import sys
+import json
+import runpy
+import socket
+import pathlib
+import threading
+import traceback
+import contextlib
+import socketserver
+
+# Must match server_socket in common.py.
+default_socket = pathlib.Path(os.environ.get('XDG_CACHE_HOME') or pathlib.Path.home()/'.cache')/'project-config'/'server.sock'
+
+# Shared by all runs. Code and caches in it are keyed by file metadata or content, so they never go stale.
+warm_cache = {}
+
+class Relay:
+    def __init__(self, connection, lock, stream):
+        self.connection = connection
+        self.lock = lock
+        self.stream = stream
+    def write(self, text):
+        if text:
+            with self.lock:
+                self.connection.sendall((json.dumps({'stream': self.stream, 'text': text}) + '\n').encode('utf-8'))
+        return len(text)
+    def flush(self):
+        pass
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        # Probe from another server checking whether this one is alive.
+        if not line:
+            return
+        request = json.loads(line)
+        lock = threading.Lock()
+        status = 0
+        try:
+            with contextlib.redirect_stdout(Relay(self.connection, lock, 'stdout')), contextlib.redirect_stderr(Relay(self.connection, lock, 'stderr')):
+                try:
+                    os.chdir(request['directory'])
+                    # Without --in-process, configure.py would call back into this server.
+                    sys.argv = [request['script'], *request['arguments'], '--in-process']
+                    runpy.run_path(request['script'], init_globals={'warm_cache': warm_cache}, run_name='__main__')
+                except SystemExit as ex:
+                    status = ex.code if isinstance(ex.code, int) else 0 if ex.code is None else 1
+                except Exception:
+                    traceback.print_exc()
+                    status = 1
+            self.connection.sendall((json.dumps({'exit': status}) + '\n').encode('utf-8'))
+        except BrokenPipeError:
+            # Client went away. Generation has been interrupted, which transactional output tolerates.
+            pass
+
+def main(args):
+    path = default_socket
+    for arg in args:
+        if arg.startswith('--socket='):
+            path = pathlib.Path(arg[len('--socket='):])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    probe = socket.socket(socket.AF_UNIX)
+    try:
+        probe.connect(str(path))
+        print(f'Another server is already listening on {path}.', file=sys.stderr)
+        return 1
+    except OSError:
+        # Left behind by server that was killed.
+        path.unlink(missing_ok=True)
+    finally:
+        probe.close()
+    # Restrictive umask only around bind, because generated files must keep default permissions.
+    umask = os.umask(0o077)
+    try:
+        server = socketserver.UnixStreamServer(str(path), RequestHandler)
+    finally:
+        os.umask(umask)
+    with server:
+        print(f'Serving generation requests on {path}.', flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            path.unlink(missing_ok=True)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,44 @@
+# Reads settings from snapshot taken by scripts/configure.py --snapshot without executing configure.py.
+# Usage: python3 snapshot.py <project directory> [setting...]
+# Prints the whole snapshot as JSON or one line per requested setting (strings are printed as is, other values as JSON).
+# Snapshot is retaken if any of its inputs changed since it was taken.
+import sys
+import json
+import pathlib
+import subprocess
+
+def load(project):
+    path = project/'.project-config'/'snapshot.json'
+    return json.loads(path.read_text('utf-8')) if path.exists() else None
+
+def is_current(project, snapshot):
+    # Fingerprints are computed by common.py itself, so that they match what configure.py recorded.
+    namespace = {
+        'project_directory': lambda: project,
+        'config_directory': lambda: pathlib.Path(snapshot['config']),
+    }
+    exec((pathlib.Path(snapshot['config'])/'src'/'loader.py').read_text(), namespace)
+    namespace['load_source']('common.py')
+    return all(namespace['input_fingerprint'](key) == fingerprint for key, fingerprint in snapshot['inputs'].items())
+
+def main(args):
+    project = pathlib.Path(args[0]).resolve()
+    snapshot = load(project)
+    if not snapshot or not is_current(project, snapshot):
+        subprocess.run([sys.executable, 'scripts/configure.py', '--snapshot'], cwd=project, stdout=subprocess.DEVNULL, check=True)
+        snapshot = load(project)
+    if len(args) == 1:
+        print(json.dumps(snapshot, indent=2))
+        return 0
+    status = 0
+    for name in args[1:]:
+        if name not in snapshot['settings']:
+            print(f'Setting {name} is not in the snapshot.', file=sys.stderr)
+            status = 1
+            continue
+        value = snapshot['settings'][name]
+        print(value if isinstance(value, str) else json.dumps(value))
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))